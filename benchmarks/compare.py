@@ -0,0 +1,29 @@
+import json
+import sys
+
+
+def key(result):
+    return result['name'] + ''.join('[%s=%s]' % item for item in sorted(result['params'].items()))
+
+
+def main(baseline_path, current_path):
+    with open(baseline_path) as fo:
+        baseline = {key(r): r for r in json.load(fo)['results']}
+    with open(current_path) as fo:
+        current = {key(r): r for r in json.load(fo)['results']}
+    print('%-55s %14s %14s %8s' % ('case', 'baseline ns', 'current ns', 'speedup'))
+    for name, result in current.items():
+        base = baseline.get(name)
+        if base is None:
+            print('%-55s %14s %14.0f %8s' % (name, '-', result['ns_per_op_min'], '-'))
+            continue
+        speedup = base['ns_per_op_min'] / result['ns_per_op_min']
+        print('%-55s %14.0f %14.0f %7.2fx' % (
+            name, base['ns_per_op_min'], result['ns_per_op_min'], speedup))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 3:
+        print('usage: compare.py BASELINE.json CURRENT.json', file=sys.stderr)
+        sys.exit(2)
+    main(sys.argv[1], sys.argv[2])
@@ -0,0 +1,129 @@
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+from suite import CASES, cleanup  # noqa: E402
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=ROOT, stderr=subprocess.DEVNULL,
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def _time_async(op, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        await op()
+    return time.perf_counter() - start
+
+
+def _time_sync(op, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        op()
+    return time.perf_counter() - start
+
+
+def measure(loop, op, repeat, min_time):
+    result = op()
+    is_async = inspect.isawaitable(result)
+    if is_async:
+        loop.run_until_complete(result)
+        timer = lambda number: loop.run_until_complete(_time_async(op, number))
+    else:
+        timer = lambda number: _time_sync(op, number)
+
+    number = 1
+    while True:
+        elapsed = timer(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed) + 1)
+    times = [elapsed / number] + [timer(number) / number for _ in range(repeat - 1)]
+    return {
+        'number': number,
+        'repeat': repeat,
+        'ns_per_op_min': min(times) * 1e9,
+        'ns_per_op_median': statistics.median(times) * 1e9,
+        'ops_per_sec': 1 / min(times),
+    }
+
+
+def measure_memory(op, count=10000):
+    """Returns the bytes allocated and kept alive by each result of `op`."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    results = [op() for _ in range(count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    # the list holding the results is not part of them
+    total -= sys.getsizeof(results)
+    return total / count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='pyautofac benchmark suite')
+    parser.add_argument('-k', dest='filter', default='', help='run cases whose name contains this')
+    parser.add_argument('-o', dest='output', help='write JSON results to this file')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--min-time', type=float, default=0.1, help='seconds per repeat')
+    parser.add_argument('--quick', action='store_true', help='--repeat 3 --min-time 0.02')
+    args = parser.parse_args(argv)
+    if args.quick:
+        args.repeat, args.min_time = 3, 0.02
+
+    loop = asyncio.new_event_loop()
+    results = []
+    try:
+        for name, params, factory in CASES:
+            if args.filter not in name:
+                continue
+            op = factory(**params)
+            result = dict(name=name, params=params, **measure(loop, op, args.repeat, args.min_time))
+            line = '%14.0f ns/op %14.0f ops/s' % (result['ns_per_op_min'], result['ops_per_sec'])
+            if getattr(op, 'measure_memory', False):
+                result['bytes_per_op'] = measure_memory(op)
+                line += ' %10.0f bytes/op' % result['bytes_per_op']
+            results.append(result)
+            label = name + ''.join('[%s=%s]' % item for item in params.items())
+            print('%-55s %s' % (label, line), file=sys.stderr)
+    finally:
+        loop.close()
+        cleanup()
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'timestamp': time.time(),
+        },
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as fo:
+            json.dump(report, fo, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == '__main__':
+    main()
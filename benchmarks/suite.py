@@ -0,0 +1,469 @@
+import asyncio
+import inspect
+import json
+import os
+import tempfile
+
+from pyautofac import ConfigurationBuilder, ContainerBuilder, Factory
+
+
+CASES = []
+_TEMP = None
+
+def case(name, **grid):
+    def decorator(func):
+        keys = list(grid)
+        combos = [{}]
+        for key in keys:
+            combos = [dict(combo, **{key: value}) for combo in combos for value in grid[key]]
+        for params in combos:
+            CASES.append((name, params, func))
+        return func
+    return decorator
+
+
+def temp_path(name):
+    """Returns a path in the suite's temporary directory, removed by `cleanup()`."""
+    global _TEMP
+    if _TEMP is None:
+        _TEMP = tempfile.TemporaryDirectory(prefix='pyautofac-bench-')
+    return os.path.join(_TEMP.name, name)
+
+
+def cleanup():
+    global _TEMP
+    if _TEMP is not None:
+        _TEMP.cleanup()
+        _TEMP = None
+
+
+def make_class(name, dependencies=()):
+    def __init__(self, *args):
+        self.args = args
+    params = [inspect.Parameter('self', inspect.Parameter.POSITIONAL_OR_KEYWORD)]
+    annotations = {}
+    for i, dependency in enumerate(dependencies):
+        param = 'p%d' % i
+        params.append(inspect.Parameter(param, inspect.Parameter.POSITIONAL_OR_KEYWORD))
+        annotations[param] = dependency
+    __init__.__signature__ = inspect.Signature(params)
+    __init__.__annotations__ = annotations
+    return type(name, (), {'__init__': __init__})
+
+
+def make_chain(depth):
+    classes = [make_class('Chain0')]
+    for i in range(1, depth):
+        classes.append(make_class('Chain%d' % i, [classes[-1]]))
+    return classes
+
+
+def make_wide(width):
+    leaves = [make_class('Leaf%d' % i) for i in range(width)]
+    return make_class('Root', leaves), leaves
+
+
+@case('build', registrations=[10, 100, 1000])
+def bench_build(registrations):
+    classes = make_chain(registrations)
+
+    def op():
+        builder = ContainerBuilder()
+        for cls in classes:
+            builder.register_class(cls)
+        builder.build()
+    return op
+
+
+@case('singleton_hot', mode=['async', 'sync'])
+def bench_singleton_hot(mode):
+    singleton = make_class('Singleton')
+    builder = ContainerBuilder()
+    builder.register_class(singleton).single_instance()
+    container = builder.build()
+    container.resolve_sync(singleton)
+    if mode == 'sync':
+        return lambda: container.resolve_sync(singleton)
+    return lambda: container.resolve(singleton)
+
+
+@case('always_new_chain', depth=[1, 5, 20], mode=['async', 'sync', 'compiled'])
+def bench_always_new_chain(depth, mode):
+    classes = make_chain(depth)
+    builder = ContainerBuilder()
+    for cls in classes:
+        builder.register_class(cls)
+    container = builder.build(compiled=mode == 'compiled')
+    top = classes[-1]
+    if mode != 'async':
+        return lambda: container.resolve_sync(top)
+    return lambda: container.resolve(top)
+
+
+@case('wide', width=[10, 50])
+def bench_wide(width):
+    root, leaves = make_wide(width)
+    builder = ContainerBuilder()
+    builder.register_class(root)
+    for leaf in leaves:
+        builder.register_class(leaf).single_instance()
+    container = builder.build()
+    return lambda: container.resolve(root)
+
+
+@case('factory_call')
+def bench_factory_call():
+    product = make_class('Product')
+    owner = make_class('Owner', [Factory[product]])
+    builder = ContainerBuilder()
+    builder.register_class(product)
+    builder.register_class(owner)
+    container = builder.build()
+    factory = container.resolve_sync(owner).args[0]
+    return factory
+
+
+@case('hot_cache', target=['root_singleton', 'nested_singleton', 'nested_per_lifetime'],
+      tasks=[1, 100])
+def bench_hot_cache(target, tasks):
+    singleton = make_class('Singleton')
+    scoped = make_class('Scoped', [singleton])
+    builder = ContainerBuilder()
+    builder.register_class(singleton).single_instance()
+    builder.register_class(scoped).per_lifetime()
+    container = builder.build()
+    nested = container.create_nested()
+    scope, cls = {
+        'root_singleton': (container, singleton),
+        'nested_singleton': (nested, singleton),
+        'nested_per_lifetime': (nested, scoped),
+    }[target]
+    scope.resolve_sync(cls)
+    if tasks == 1:
+        return lambda: scope.resolve(cls)
+
+    async def op():
+        # concurrent resolves of an already cached instance
+        await asyncio.gather(*(scope.resolve(cls) for _ in range(tasks)))
+    return op
+
+
+@case('scope_create', registrations=[1, 100, 1000])
+def bench_scope_create(registrations):
+    builder = ContainerBuilder()
+    for i in range(registrations):
+        builder.register_class(make_class('Service%d' % i)).per_lifetime()
+    container = builder.build()
+
+    async def op():
+        async with container.create_nested():
+            pass
+    return op
+
+
+@case('scope_memory', state=['idle', 'used'])
+def bench_scope_memory(state):
+    singleton = make_class('Singleton')
+    scoped = make_class('Scoped', [singleton])
+    builder = ContainerBuilder()
+    builder.register_class(singleton).single_instance()
+    builder.register_class(scoped).per_lifetime()
+    container = builder.build()
+    container.resolve_sync(singleton)
+
+    def op():
+        scope = container.create_nested()
+        if state == 'used':
+            scope.resolve_sync(scoped)
+        return scope
+    # the runner also reports the memory retained by each returned scope
+    op.measure_memory = True
+    return op
+
+
+@case('scope_request', registrations=[10, 1000], dependencies=[5])
+def bench_scope_request(registrations, dependencies):
+    root, leaves = make_wide(dependencies)
+    builder = ContainerBuilder()
+    builder.register_class(root).per_lifetime()
+    for i, leaf in enumerate(leaves):
+        proxy = builder.register_class(leaf)
+        if i % 2:
+            proxy.single_instance()
+        else:
+            proxy.per_lifetime()
+    for i in range(registrations):
+        builder.register_class(make_class('Filler%d' % i))
+    container = builder.build()
+
+    async def op():
+        async with container.create_nested() as nested:
+            await nested.resolve(root)
+    return op
+
+
+def _write_config(keys, depth):
+    path = temp_path('config_%d_%d.json' % (keys, depth))
+    if os.path.exists(path):
+        return path
+    data = {}
+    for i in range(keys):
+        node = data
+        for level in range(depth - 1):
+            node = node.setdefault('section%d' % ((i >> (4 * level)) % 16), {})
+        node['key%d' % i] = str(i)
+    with open(path, 'w') as fo:
+        json.dump(data, fo)
+    return path
+
+
+@case('config_load', keys=[100, 10000], depth=[1, 4])
+def bench_config_load(keys, depth):
+    path = _write_config(keys, depth)
+
+    def op():
+        ConfigurationBuilder().add_json_file(path).build()
+    return op
+
+
+@case('config_stream', keys=[10000, 200000], streaming=[False, True])
+def bench_config_stream(keys, streaming):
+    path = _write_config(keys, 4)
+
+    def op():
+        ConfigurationBuilder().add_json_file(path, streaming=streaming).build()
+    return op
+
+
+@case('config_section', keys=[100, 10000])
+def bench_config_section(keys):
+    path = _write_config(keys, 3)
+    config = ConfigurationBuilder().add_json_file(path).build()
+    return lambda: config.get_section('section0')
+
+
+@case('expensive_per_request', lifetime=['always_new', 'pooled'])
+def bench_expensive_per_request(lifetime):
+    class Expensive:
+        def __init__(self):
+            self.table = [0] * 10000
+
+    builder = ContainerBuilder()
+    proxy = builder.register_class(Expensive)
+    if lifetime == 'pooled':
+        proxy.pooled(reset=lambda inst: None)
+    container = builder.build()
+
+    async def op():
+        async with container.create_nested() as nested:
+            await nested.resolve(Expensive)
+    return op
+
+
+@case('wide_handler', injection=['eager', 'lazy'], width=[10])
+def bench_wide_handler(injection, width):
+    from pyautofac import IAsyncResource, Lazy
+
+    class Service(IAsyncResource):
+        async def initialize(self):
+            pass
+
+        async def dispose(self, exc=None):
+            pass
+
+    services = [type('Service%d' % i, (Service,), {}) for i in range(width)]
+    markers = services if injection == 'eager' else [Lazy[s] for s in services]
+    handler = make_class('Handler', markers)
+    builder = ContainerBuilder()
+    builder.register_class(handler).per_lifetime()
+    for service in services:
+        builder.register_class(service).per_lifetime()
+    container = builder.build()
+
+    async def op():
+        async with container.create_nested() as nested:
+            instance = await nested.resolve(handler)
+            if injection == 'lazy':
+                for dependency in instance.args[:2]:
+                    await dependency()
+    return op
+
+
+@case('resolve_batch', mode=['sequential', 'resolve_many'], scope=['hot', 'new'], count=[8])
+def bench_resolve_batch(mode, scope, count):
+    services = [make_class('Service%d' % i) for i in range(count)]
+    builder = ContainerBuilder()
+    for service in services:
+        builder.register_class(service).per_lifetime()
+    container = builder.build()
+    hot = container.create_nested()
+
+    async def resolve(target):
+        if mode == 'resolve_many':
+            return await target.resolve_many(*services)
+        return [await target.resolve(service) for service in services]
+
+    if scope == 'hot':
+        return lambda: resolve(hot)
+    return lambda: resolve(container.create_nested())
+
+
+@case('collection', mode=['registry', 'injected'], members=[10])
+def bench_collection(mode, members):
+    from typing import List
+
+    class IHandler:
+        pass
+
+    handlers = [type('Handler%d' % i, (IHandler,), {}) for i in range(members)]
+    builder = ContainerBuilder()
+    for handler in handlers:
+        builder.register_class(handler).as_interface(IHandler).allow_multiple().single_instance()
+    if mode == 'injected':
+        pipeline = make_class('Pipeline', [List[IHandler]])
+        builder.register_class(pipeline)
+        container = builder.build()
+        return lambda: container.create_nested().resolve(pipeline)
+
+    for handler in handlers:
+        builder.register_class(handler).single_instance()
+    container = builder.build()
+
+    async def op():
+        nested = container.create_nested()
+        return [await nested.resolve(handler) for handler in handlers]
+    return op
+
+
+@case('tenant_scope', mode=['rebuild', 'overlay'], registrations=[100, 1000])
+def bench_tenant_scope(mode, registrations):
+    classes = make_chain(registrations)
+    tenant = make_class('TenantSettings')
+
+    def register(builder):
+        builder.register_class(tenant).single_instance()
+
+    builder = ContainerBuilder()
+    for cls in classes:
+        builder.register_class(cls).single_instance()
+    container = builder.build()
+
+    if mode == 'overlay':
+        return lambda: container.create_nested(register)
+
+    def op():
+        builder = ContainerBuilder()
+        for cls in classes:
+            builder.register_class(cls).single_instance()
+        register(builder)
+        return builder.build()
+    return op
+
+
+def _import_generated_module(name, registrations):
+    import importlib
+    import sys
+
+    directory = temp_path(name)
+    os.mkdir(directory)
+    lines = ['class Chain0:\n    pass\n']
+    for i in range(1, registrations):
+        lines.append(
+            'class Chain%d:\n    def __init__(self, a: Chain%d, b: Chain0):\n        pass\n'
+            % (i, i - 1))
+    with open(os.path.join(directory, name + '.py'), 'w') as fo:
+        fo.write('\n\n'.join(lines))
+    sys.path.insert(0, directory)
+    try:
+        module = importlib.import_module(name)
+    finally:
+        sys.path.remove(directory)
+    return [getattr(module, 'Chain%d' % i) for i in range(registrations)], directory
+
+
+@case('build_metadata', mode=['inspect', 'cached'], registrations=[100, 1000])
+def bench_build_metadata(mode, registrations):
+    classes, directory = _import_generated_module(
+        'generated_%s_%d' % (mode, registrations), registrations)
+    cache = os.path.join(directory, 'metadata.json') if mode == 'cached' else None
+
+    def op():
+        builder = ContainerBuilder()
+        for cls in classes:
+            builder.register_class(cls)
+        builder.build(metadata_cache=cache)
+    op()
+    return op
+
+
+@case('config_parse', type=['int', 'timedelta', 'datetime', 'json', 'json_cached'])
+def bench_config_parse(type):
+    from datetime import datetime, timedelta
+
+    values = {
+        'int': (int, '1234'),
+        'timedelta': (timedelta, '1:30:00'),
+        'datetime': (datetime, '2020-01-02T03:04:05'),
+        'json': (json, '{"flags": [1, 2, 3], "enabled": true}'),
+    }
+    builder = ConfigurationBuilder()
+    if type == 'json_cached':
+        type = 'json'
+        builder.add_parser(json, cache=True)
+    parsed_type, value = values[type]
+    config = builder.add_dict({'value': value}).build()
+    return lambda: config.parse_value('value', parsed_type)
+
+
+@case('config_bind', mode=['parse_value', 'bind'])
+def bench_config_bind(mode):
+    from datetime import timedelta
+
+    class Settings:
+        host: str
+        port: int
+        debug: bool
+        timeout: timedelta
+
+    config = ConfigurationBuilder().add_dict({'service': {
+        'host': 'localhost', 'port': '8080', 'debug': 'no', 'timeout': '0:30',
+    }}).build()
+
+    if mode == 'bind':
+        return lambda: config.get_section('service').bind(Settings)
+
+    def op():
+        section = config.get_section('service')
+        settings = Settings()
+        settings.host = section.parse_value('host', str)
+        settings.port = section.parse_value('port', int)
+        settings.debug = section.parse_value('debug', bool)
+        settings.timeout = section.parse_value('timeout', timedelta)
+        return settings
+    return op
+
+
+@case('config_reload', mode=['rebuild', 'reload'], keys=[10000])
+def bench_config_reload(mode, keys):
+    base = _write_config(keys, 3)
+    override = temp_path('override_%s_%d.json' % (mode, keys))
+    state = {'value': 0}
+
+    def touch():
+        state['value'] += 1
+        with open(override, 'w') as fo:
+            json.dump({'feature': {'enabled': state['value'] % 2}, 'counter': state['value']}, fo)
+
+    touch()
+    if mode == 'rebuild':
+        def op():
+            touch()
+            ConfigurationBuilder().add_json_file(base).add_json_file(override).build()
+        return op
+
+    config = ConfigurationBuilder().add_json_file(base).add_json_file(override).build_reloadable()
+
+    def op():
+        touch()
+        config.reload()
+    return op
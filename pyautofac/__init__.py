@@ -1,8 +1,44 @@
-from pyautofac.async_resource import IAsyncResource
-from pyautofac.builder import ContainerBuilder
-from pyautofac.container import IContainer
-from pyautofac.configuration import IConfiguration, ConfigurationBuilder
-from pyautofac.factory import Factory
+import sys
+from importlib import import_module
 
 
 __version__ = '0.2.4'
+
+# public names are imported on first access, so that e.g. tools needing only
+# ConfigurationBuilder do not pay for importing asyncio and the container
+_EXPORTS = {
+    'IAsyncResource': 'pyautofac.async_resource',
+    'ContainerBuilder': 'pyautofac.builder',
+    'IContainer': 'pyautofac.container',
+    'IConfiguration': 'pyautofac.configuration',
+    'ConfigurationBuilder': 'pyautofac.configuration',
+    'ReloadableConfiguration': 'pyautofac.reloadable',
+    'Factory': 'pyautofac.factory',
+    'Lazy': 'pyautofac.factory',
+    'SyncFactory': 'pyautofac.factory',
+    'ContainerStats': 'pyautofac.stats',
+}
+
+__all__ = list(_EXPORTS)
+# `globals` itself is shadowed once the pyautofac.globals submodule is imported
+_namespace = globals()
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError('module %r has no attribute %r' % (__name__, name))
+    value = getattr(import_module(module), name)
+    _namespace[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(_namespace) | set(__all__))
+
+
+if sys.version_info < (3, 7):
+    # module level __getattr__ (PEP 562) is not supported, import eagerly
+    for _name in __all__:
+        __getattr__(_name)
+    del _name
@@ -1,9 +1,21 @@
+from types import MappingProxyType
+from typing import List
+
+from pyautofac.codegen import compile_constructors
 from pyautofac.container import Container, DummyContainer
 from pyautofac.exceptions import AlreadyRegistered
 from pyautofac.globals import Tags
+from pyautofac.graph import DependencyGraph
+from pyautofac.metadata import MetadataCache
+from pyautofac.plan import (
+    Registration, collection_item, compile_collection_plan, compile_plan,
+)
 from pyautofac.proxies import ClassProxy, InstanceProxy
 
 
+_EMPTY = MappingProxyType({})
+
+
 class ContainerBuilder:
     def __init__(self):
         self._proxies = []
@@ -19,11 +31,76 @@ class ContainerBuilder:
     def register_instance(self, inst):
         return self._register(inst, InstanceProxy)
 
-    def build(self):
+    def register_settings(self, cls, configuration):
+        return self.register_instance(configuration.bind(cls)).as_interface(cls)
+
+    def _registrations(self):
         mapping = {}
         for pr in self._proxies:
-            if pr.interface in mapping and not pr.overwrite:
+            registered = mapping.get(pr.interface)
+            if registered is None or pr.overwrite:
+                mapping[pr.interface] = [pr]
+            elif pr.multiple:
+                registered.append(pr)
+            else:
                 raise AlreadyRegistered('Interface [%s] is already registered' % pr.interface)
-            mapping[pr.interface] = pr
+        return mapping
+
+    def _compile(self, parallel, base=_EMPTY, metadata=None):
+        plans = {}
+        collections = {}
+        for interface, proxies in self._registrations().items():
+            members = [compile_plan(pr, parallel, metadata) for pr in proxies]
+            keys = [Registration(interface, index) for index in range(len(members) - 1)]
+            keys.append(interface)
+            plans.update(zip(keys, members))
+            collections[interface] = keys, members
+            if any(pr.multiple for pr in proxies) or base and List[interface] in base:
+                plans[List[interface]] = compile_collection_plan(interface, keys, members)
+        for plan in list(plans.values()):
+            for dependency in plan.dependencies:
+                item = collection_item(dependency.type)
+                if item is None or dependency.type in plans or dependency.type in base:
+                    continue
+                if item in collections:
+                    keys, members = collections[item]
+                elif item in base:
+                    keys, members = (item,), (base[item],)
+                else:
+                    keys, members = (), ()
+                plans[dependency.type] = compile_collection_plan(item, keys, members)
+        return plans
+
+    def build(self, parallel=False, validate=False, stats=None, compiled=False,
+              metadata_cache=None):
+        metadata = None if metadata_cache is None else MetadataCache(metadata_cache)
+        plans = self._compile(parallel, metadata=metadata)
+        if metadata is not None:
+            metadata.save()
+        graph = DependencyGraph(plans)
+        if validate:
+            graph.validate()
+        if compiled:
+            compile_constructors(plans, graph)
         parent = DummyContainer()
-        return Container(mapping, parent)
+        options = {'parallel': parallel, 'compiled': compiled}
+        return Container(plans, parent, graph=graph, stats=stats, options=options)
+
+    def build_overlay(self, mapping, graph, parallel=False, compiled=False):
+        """Layers the registrations over `mapping` without mutating it.
+
+        Parent plans that depend on an overridden interface are copied, so the
+        returned `overlay` holds every key that has to be resolved from the
+        child instead of the parent.
+        """
+        plans = self._compile(parallel, mapping)
+        for interface in graph.affected_by(plans):
+            if interface not in plans:
+                plans[interface] = mapping[interface].copy()
+        overlay = frozenset(plans)
+        merged = dict(mapping)
+        merged.update(plans)
+        graph = DependencyGraph(merged, graph, overlay)
+        if compiled:
+            compile_constructors(merged, graph, overlay)
+        return merged, graph, overlay
@@ -0,0 +1,81 @@
+from pyautofac.container import _RESOLVERS
+from pyautofac.globals import DependencyKind, Tags
+
+
+# maximum number of always_new constructors inlined into a single function
+_INLINE_BUDGET = 64
+
+
+class _Namespace:
+    def __init__(self):
+        self.values = {}
+        self._names = {}
+
+    def bind(self, value, prefix):
+        key = (prefix, id(value))
+        name = self._names.get(key)
+        if name is None:
+            name = self._names[key] = '_%s%d' % (prefix, len(self._names))
+            self.values[name] = value
+        return name
+
+
+def _can_inline(plan):
+    return (
+        plan is not None and plan.error is None and not plan.has_instance
+        and plan.tag is Tags.AlwaysNew and plan.sync and not plan.cyclic
+    )
+
+
+def _can_compile(plan):
+    return plan.error is None and not plan.has_instance and plan.sync and not plan.cyclic
+
+
+def _dependency_expression(plans, dependency, namespace, budget):
+    if dependency.kind is not DependencyKind.Service:
+        return '%s(%s, container)' % (
+            namespace.bind(_RESOLVERS[dependency.kind], 'f'), namespace.bind(dependency.type, 't'))
+    plan = plans.get(dependency.type)
+    if plan is not None and plan.error is None and plan.has_instance:
+        return namespace.bind(plan.instance, 'i')
+    if _can_inline(plan):
+        if budget[0] > 0:
+            budget[0] -= 1
+            return _constructor_expression(plans, plan, namespace, budget)
+        if plan.compiled is not None:
+            return '%s(container)' % namespace.bind(plan.compiled, 'c')
+    return 'resolve(%s, ())' % namespace.bind(dependency.type, 't')
+
+
+def _constructor_expression(plans, plan, namespace, budget):
+    args = [
+        _dependency_expression(plans, dependency, namespace, budget)
+        for dependency in plan.dependencies
+    ]
+    return '%s(%s)' % (namespace.bind(plan.registered_type, 't'), ', '.join(args))
+
+
+def compile_constructor(plans, plan):
+    namespace = _Namespace()
+    expression = _constructor_expression(plans, plan, namespace, [_INLINE_BUDGET])
+    source = 'def construct(container):\n'
+    if 'resolve(' in expression:
+        source += '    resolve = container._resolve_sync\n'
+    source += '    return %s\n' % expression
+    exec(source, namespace.values)
+    construct = namespace.values['construct']
+    construct.__qualname__ = construct.__name__ = 'construct_%s' % plan.registered_type.__name__
+    construct.source = source
+    return construct
+
+
+def compile_constructors(plans, graph, interfaces=None):
+    """Compiles the plans of `interfaces` (all of `plans` by default)."""
+    if interfaces is None:
+        interfaces = plans
+    compilable = {
+        interface for interface in interfaces if _can_compile(plans[interface])
+    }
+    for interface in graph.order(compilable):
+        plan = plans[interface]
+        plan.compiled = compile_constructor(plans, plan)
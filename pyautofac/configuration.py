@@ -1,9 +1,11 @@
-import copy
 import os
 import json
 import sys
 from abc import ABCMeta, abstractmethod
+from collections.abc import Mapping
 from datetime import datetime, timedelta
+from decimal import Decimal
+from types import MappingProxyType, MemberDescriptorType
 try:
     import ujson
 except ImportError:
@@ -24,6 +26,9 @@ class IConfiguration(metaclass=ABCMeta):
     def __getitem__(self, key):
         raise NotImplementedError()
 
+    def bind(self, cls):
+        return _get_binding(cls).bind(self)
+
 
 def parse_timedelta(value):
     if not value:
@@ -70,6 +75,21 @@ def parse_bool(data):
     raise ValueError('Invalid boolean value')
 
 
+# parsed values of these types are always cached, anything else (JSON objects,
+# results of custom parsers) only when the parser was added with cache=True
+_IMMUTABLE = frozenset((str, int, float, bool, type(None), datetime, timedelta, Decimal))
+
+
+class _CachedParser:
+    """Wraps a parser whose results are cached even when they are mutable."""
+    __slots__ = ('parse',)
+
+    def __init__(self, parse):
+        self.parse = parse
+
+    def __call__(self, value):
+        return self.parse(value)
+
 _PARSERS = {
     bool: parse_bool,
     str: lambda value: value,
@@ -80,9 +100,166 @@ _PARSERS = {
     datetime: parse_datetime,
     timedelta: parse_timedelta,
 }
+
+
+class _Binding:
+    """Precomputed recipe turning a configuration (section) into a frozen `cls`."""
+    __slots__ = ('type', 'fields')
+
+    def __init__(self, cls):
+        from typing import get_type_hints
+        fields = []
+        for name, annotation in get_type_hints(cls).items():
+            # annotated classes are bound from sections unless a parser is registered for them
+            nested = annotation not in _PARSERS and bool(getattr(annotation, '__annotations__', None))
+            default = getattr(cls, name, _PLACEHOLDER)
+            if isinstance(default, MemberDescriptorType):
+                default = _PLACEHOLDER
+            fields.append((name, annotation, nested, default))
+        self.fields = tuple(fields)
+        self.type = _frozen_type(cls, [name for name, _, _, _ in fields])
+
+    def bind(self, configuration):
+        instance = object.__new__(self.type)
+        parsers = getattr(configuration, '_parsers', _PARSERS)
+        for name, type, nested, default in self.fields:
+            if nested and type not in parsers:
+                value = configuration.get_section(name).bind(type)
+            else:
+                try:
+                    value = configuration.parse_value(name, type)
+                except KeyError:
+                    if default is _PLACEHOLDER:
+                        raise KeyError('Missing configuration key [%s] required by [%s]'
+                                       % (name, self.type.__qualname__))
+                    value = default
+            object.__setattr__(instance, name, value)
+        return instance
+
+
+def _frozen_setattr(self, name, value):
+    raise AttributeError('[%s] settings are read-only' % type(self).__qualname__)
+
+
+def _frozen_delattr(self, name):
+    raise AttributeError('[%s] settings are read-only' % type(self).__qualname__)
+
+
+def _frozen_repr(self):
+    return '%s(%s)' % (type(self).__qualname__, ', '.join(
+        '%s=%r' % (name, getattr(self, name)) for name in type(self)._fields))
+
+
+def _frozen_type(cls, names):
+    slotted = {slot for base in cls.__mro__ for slot in getattr(base, '__slots__', ())}
+    return type(cls.__name__, (cls,), {
+        '__slots__': tuple(name for name in names if name not in slotted),
+        '__module__': cls.__module__,
+        '__qualname__': cls.__qualname__,
+        '__setattr__': _frozen_setattr,
+        '__delattr__': _frozen_delattr,
+        '__repr__': _frozen_repr,
+        '_fields': tuple(names),
+    })
+
+
+_BINDINGS = {}
+def _get_binding(cls):
+    binding = _BINDINGS.get(cls)
+    if binding is None:
+        binding = _BINDINGS[cls] = _Binding(cls)
+    return binding
+
+
+def _build_index(mapping):
+    """Unflattens `mapping` into nested read-only mappings, one per section.
+
+    A key that is both a value and a section (`a` and `a:b`) is exposed as
+    a section; the value is still available through `get()`.
+    """
+    root = {}
+    # sibling keys share their parent, so most keys cost a single lookup here
+    nodes = {'': root}
+    for key, value in mapping.items():
+        parent, _, last = key.rpartition(_NESTING_SEPARATOR)
+        node = nodes.get(parent)
+        if node is None:
+            node = _section_node(nodes, parent)
+        if not isinstance(node.get(last), MappingProxyType):
+            node[last] = value
+    return MappingProxyType(root)
+
+
+def _section_node(nodes, prefix):
+    node = nodes.get(prefix)
+    if node is None:
+        parent, _, last = prefix.rpartition(_NESTING_SEPARATOR)
+        node = nodes[prefix] = {}
+        _section_node(nodes, parent)[last] = MappingProxyType(node)
+    return node
+
+
+def _update_index(index, mapping, keys):
+    """Returns `index` updated to `mapping` for the changed `keys`.
+
+    Only sections on the path of a changed key are copied, all other
+    sections are shared with `index`.
+    """
+    nodes = {'': dict(index)}
+
+    def copy(prefix):
+        node = nodes.get(prefix)
+        if node is None:
+            parent, _, last = prefix.rpartition(_NESTING_SEPARATOR)
+            current = copy(parent).get(last)
+            node = nodes[prefix] = dict(current) if isinstance(current, MappingProxyType) else {}
+        return node
+
+    for key in keys:
+        parent, _, last = key.rpartition(_NESTING_SEPARATOR)
+        node = copy(parent)
+        if isinstance(node.get(last), MappingProxyType):
+            continue
+        value = mapping.get(key, _PLACEHOLDER)
+        if value is _PLACEHOLDER:
+            node.pop(last, None)
+        else:
+            node[last] = value
+    # deepest sections first, so that parents receive the new read-only views
+    depth = lambda prefix: prefix.count(_NESTING_SEPARATOR)
+    for prefix in sorted(nodes, key=depth, reverse=True):
+        if not prefix:
+            continue
+        parent, _, last = prefix.rpartition(_NESTING_SEPARATOR)
+        node = nodes[prefix]
+        if node:
+            nodes[parent][last] = MappingProxyType(node)
+        elif prefix in mapping:
+            nodes[parent][last] = mapping[prefix]
+        else:
+            nodes[parent].pop(last, None)
+    return MappingProxyType(nodes[''])
+
+
+def _to_dict(mapping):
+    return {
+        key: _to_dict(value) if isinstance(value, Mapping) else value
+        for key, value in mapping.items()
+    }
+
+
 class DictConfiguration(IConfiguration):
-    def __init__(self, mapping):
+    def __init__(self, mapping, index=None, sections=None, prefix=None, parsers=None):
         self._mapping = mapping
+        # sections share the index and the section cache of the root configuration;
+        # the root builds the index on first get_section()
+        self._index = index
+        self._sections = {} if sections is None else sections
+        self._prefix = prefix
+        self._parsers = _PARSERS if parsers is None else parsers
+        # the mapping never changes, so immutable parsed values are kept per (key, type)
+        self._parsed = {}
+        self._bound = {}
 
     def get(self, key, default=_PLACEHOLDER):
         try:
@@ -93,36 +270,53 @@ class DictConfiguration(IConfiguration):
             raise
 
     def parse_value(self, key, type=str):
-        value = self.get(key)
-        parser = _PARSERS.get(type, _PLACEHOLDER)
+        cache_key = (key, type)
+        value = self._parsed.get(cache_key, _PLACEHOLDER)
+        if value is not _PLACEHOLDER:
+            return value
+        parser = self._parsers.get(type, _PLACEHOLDER)
         if parser is _PLACEHOLDER:
             raise TypeError("Don't know how to parse [%s] type." % type)
-        return parser(value)
+        value = parser(self.get(key))
+        if value.__class__ in _IMMUTABLE or parser.__class__ is _CachedParser:
+            self._parsed[cache_key] = value
+        return value
+
+    def bind(self, cls):
+        instance = self._bound.get(cls)
+        if instance is None:
+            instance = self._bound[cls] = _get_binding(cls).bind(self)
+        return instance
 
     def get_section(self, prefix):
-        result = {}
-        for key, value in self._mapping.items():
-            if key.startswith(prefix):
-                key = key[len(prefix):]
-                if not (key != '' and key[0] == _NESTING_SEPARATOR):
-                    continue
-                key = key[1:].split(_NESTING_SEPARATOR)
-                last = key.pop()
-                root = result
-                for subkey in key:
-                    if subkey not in root:
-                        root[subkey] = {}
-                    root = root[subkey]
-                root[last] = value
-        return DictConfiguration(result)
+        if self._prefix is not None:
+            prefix = self._prefix + _NESTING_SEPARATOR + prefix
+        section = self._sections.get(prefix)
+        if section is not None:
+            return section
+        index = self._index
+        if index is None:
+            index = self._index = _build_index(self._mapping)
+        node = index
+        for part in prefix.split(_NESTING_SEPARATOR):
+            node = node.get(part)
+            if not isinstance(node, Mapping):
+                # missing sections are empty, but keep the parsers of this configuration
+                node = _EMPTY
+                break
+        section = self._sections[prefix] = DictConfiguration(
+            node, index, self._sections, prefix, self._parsers)
+        return section
 
     def to_dict(self):
-        return copy.deepcopy(self._mapping)
+        return _to_dict(self._mapping)
 
     def __getitem__(self, key):
         return self._mapping[key]
 
 
+_EMPTY = MappingProxyType({})
+
 
 def read_file(path, processor, optional):
     if not isinstance(path, (str, bytes)):
@@ -137,8 +331,18 @@ def read_file(path, processor, optional):
         return processor(fo)
 
 
+def file_stamp(path):
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError, ValueError):
+        return None
+    return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+
 _NESTING_SEPARATOR = ':'
-def flatten_dict(dct, prefix=[], result={}):
+def flatten_dict(dct, prefix=[], result=None):
+    if result is None:
+        result = {}
     for key, value in dct.items():
         prefix_copy = prefix[:]
         prefix_copy.append(key)
@@ -150,10 +354,102 @@ def flatten_dict(dct, prefix=[], result={}):
     return result
 
 
+def _flatten(dct):
+    if not isinstance(dct, dict):
+        raise TypeError('dct is not a dict')
+    return flatten_dict(dct)
+
+
+# Sources remember how each layer of a configuration was produced, so that a
+# reloadable configuration can re-apply them in the original order.
+class _DictSource:
+    __slots__ = ('data',)
+
+    def __init__(self, data):
+        self.data = data
+
+    def changed(self):
+        return False
+
+    def apply(self, mapping):
+        mapping.update(self.data)
+
+
+class _FileSource:
+    __slots__ = ('path', 'processor', 'optional', 'stamp', 'data')
+
+    def __init__(self, path, processor, optional):
+        self.path = path
+        self.processor = processor
+        self.optional = optional
+        self.stamp, self.data = self.read()
+
+    def read(self):
+        # stat first: a write racing with the read shows up as a new stamp later
+        stamp = file_stamp(self.path)
+        return stamp, read_file(self.path, self.processor, self.optional)
+
+    def changed(self):
+        return file_stamp(self.path) != self.stamp
+
+    def apply(self, mapping):
+        mapping.update(self.data)
+
+
 _ENV_KEY_SEPARTOR = '__'
+class _EnvironmentSource:
+    __slots__ = ('prefix',)
+
+    def __init__(self, prefix):
+        self.prefix = prefix
+
+    def changed(self):
+        return False
+
+    def apply(self, mapping):
+        env = os.environ
+        prefix = self.prefix
+        for k in list(mapping.keys()):
+            new_key = k.replace(_NESTING_SEPARATOR, _ENV_KEY_SEPARTOR)
+            if prefix is not None:
+                new_key = prefix + _ENV_KEY_SEPARTOR + new_key
+            try:
+                value = env[new_key]
+            except KeyError:
+                continue
+            mapping[k] = value
+
+
+# File processors return flat mappings; the streaming ones never build the
+# nested document.
+def _json_processor(streaming):
+    if streaming:
+        from pyautofac.loaders import flatten_json
+        return flatten_json
+    return lambda fo: _flatten(ujson.load(fo))
+
+
+def _yaml_processor(streaming):
+    try:
+        from yaml import load
+    except ImportError:
+        raise ImportError('[add_yaml_file] method requires PyYAML package')
+
+    try:
+        from yaml import CLoader as Loader
+    except ImportError:
+        from yaml import Loader
+    if streaming:
+        from pyautofac.loaders import flatten_yaml
+        return lambda fo: flatten_yaml(fo, Loader)
+    return lambda fo: _flatten(load(fo, Loader=Loader))
+
+
 class ConfigurationBuilder:
     def __init__(self):
         self._mapping = {}
+        self._sources = []
+        self._parsers = None
 
     def get(self, key, default=_PLACEHOLDER):
         try:
@@ -163,52 +459,28 @@ class ConfigurationBuilder:
                 return default
             raise
 
-    def add_dict(self, dct):
-        if not isinstance(dct, dict):
-            raise TypeError('dct is not a dict')
-        flatten = flatten_dict(dct)
-        self._mapping.update(flatten)
+    def _add_source(self, source):
+        source.apply(self._mapping)
+        self._sources.append(source)
         return self
 
-    def add_yaml_file(self, path, optional=False):
-        try:
-            from yaml import load
-        except ImportError:
-            raise ImportError('[add_yaml_file] method requires PyYAML package')
+    def add_dict(self, dct):
+        return self._add_source(_DictSource(_flatten(dct)))
 
-        try:
-            from yaml import CLoader as Loader
-        except ImportError:
-            from yaml import Loader
-        processor = lambda fo: load(fo, Loader=Loader)
-        data = read_file(path, processor, optional)
-        self.add_dict(data)
-        return self
+    def add_yaml_file(self, path, optional=False, streaming=False):
+        return self._add_source(_FileSource(path, _yaml_processor(streaming), optional))
 
-    def add_json_file(self, path, optional=False):
-        data = read_file(path, ujson.load, optional)
-        self.add_dict(data)
-        return self
+    def add_json_file(self, path, optional=False, streaming=False):
+        return self._add_source(_FileSource(path, _json_processor(streaming), optional))
 
     def add_environment_variables(self, prefix=None):
-        env = os.environ
-        keys = list(self._mapping.keys())
-        for k in keys:
-            new_key = k.replace(_NESTING_SEPARATOR, _ENV_KEY_SEPARTOR)
-            if prefix is not None:
-                new_key = prefix + _ENV_KEY_SEPARTOR + new_key
-            try:
-                value = env[new_key]
-            except KeyError:
-                continue
-            self._mapping[k] = value
-        return self
+        return self._add_source(_EnvironmentSource(prefix))
 
     def add_command_line(self, args=None):
         if args is None:
             args = sys.argv[1:]
         args = list(reversed(args))
-        result = self._mapping
+        result = {}
         while args:
             key = args.pop()
             if not key.startswith('--'):
@@ -224,10 +496,38 @@ class ConfigurationBuilder:
             if value.startswith('--'):
                 raise ValueError('Command line value cannot start with [--]')
             result[key] = value
-        self._mapping.update(result)
+        return self._add_source(_DictSource(result))
+
+    def add_parser(self, type, parser=None, cache=False):
+        """Registers `parser(str)` used by `parse_value(key, type)`.
+
+        Immutable results (strings, numbers, dates...) are always cached per
+        key. With `cache=True` any other result is cached too and shared by
+        all callers, which must not modify it. Without `parser` only the
+        caching of the already known parser of `type` changes, e.g.
+        `add_parser(json, cache=True)`.
+        """
+        if self._parsers is None:
+            self._parsers = dict(_PARSERS)
+        if parser is None:
+            parser = self._parsers.get(type)
+            if parser is None:
+                raise TypeError("Don't know how to parse [%s] type." % type)
+        elif not callable(parser):
+            raise TypeError('parser is not callable')
+        if parser.__class__ is _CachedParser:
+            parser = parser.parse
+        self._parsers[type] = _CachedParser(parser) if cache else parser
         return self
 
     def build(self):
         mapping = self._mapping
         self._mapping = {}
-        return DictConfiguration(mapping)
+        self._sources = []
+        return DictConfiguration(mapping, parsers=self._parsers)
+
+    def build_reloadable(self):
+        from pyautofac.reloadable import ReloadableConfiguration
+        sources = self._sources
+        snapshot = self.build()
+        return ReloadableConfiguration(sources, snapshot, self._parsers)
@@ -1,35 +1,61 @@
-import inspect
-from asyncio import Future
-from asyncio import Lock as AsyncLock
+import copy
+import gc
+import os
+import time
+from asyncio import Semaphore, gather, wait_for, wrap_future
 from abc import ABCMeta, abstractmethod
+from concurrent.futures import Future
 from threading import Lock
+from types import MappingProxyType
 
 from pyautofac.async_resource import IAsyncResource
 from pyautofac.exceptions import (
-    AlreadyRegistered, NotRegistered, NotAnnotatedConstructorParam, NotSubclass,
+    AlreadyRegistered, CircularDependency, DisposeError, NotRegistered, NotSubclass,
+    NotSyncResolvable, PoolExhausted,
 )
-from pyautofac.globals import Tags
-from pyautofac.factory import TypeFactory
+from pyautofac.globals import DependencyKind, Tags
+from pyautofac.graph import DependencyGraph
+from pyautofac.plan import compile_dependency, get_constructor_params
+from pyautofac.pool import InstancePool, call_hook
+from pyautofac.factory import SyncTypeFactory, TypeFactory, TypeLazy
 
 get_type = type
 _PLACEHOLDER = object()
+_RETRY = object()
+_EMPTY = MappingProxyType({})
+# guards the lazy creation of scope locks; idle scopes never allocate one
+_LOCK_INIT = Lock()
 
-def get_constructor_params(cls):
-    ctr = cls.__init__
-    try:
-        ann = ctr.__annotations__
-    except AttributeError:
-        return
-    params = inspect.signature(ctr).parameters
-    iter_params = iter(params)
-    next(iter_params)  # ignore self
-    for p in iter_params:
-        if p not in ann:
-            raise NotAnnotatedConstructorParam(p)
-        yield ann[p]
+
+def _raise_plan_error(plan):
+    # inspects the constructor again on this cold path, so that every resolve
+    # raises a fresh exception instead of growing the traceback of the stored one
+    for param in get_constructor_params(plan.registered_type):
+        compile_dependency(param)
+    raise copy.copy(plan.error)
+
+
+def _reset_lock_init():
+    # another thread may have held the lock when the process forked
+    global _LOCK_INIT
+    _LOCK_INIT = Lock()
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_lock_init)
+
+
+class _Pending:
+    # the future is only allocated once a second caller has to wait
+    __slots__ = ('future',)
+
+    def __init__(self):
+        self.future = None
 
 
 class IContainer(metaclass=ABCMeta):
+    __slots__ = ()
+
     @abstractmethod
     def add_instance(self, instance, type=None):
         raise NotImplementedError()
@@ -38,6 +64,17 @@ class IContainer(metaclass=ABCMeta):
     async def resolve(self, cls):
         raise NotImplementedError()
 
+    async def resolve_all(self, types, parallel=False):
+        if parallel:
+            return list(await gather(*(self.resolve(cls) for cls in types)))
+        result = []
+        for cls in types:
+            result.append(await self.resolve(cls))
+        return result
+
+    def resolve_many(self, *types, parallel=False):
+        return self.resolve_all(types, parallel)
+
     @abstractmethod
     async def dispose(self, exc=None):
         raise NotImplementedError()
@@ -56,6 +93,8 @@ class IContainer(metaclass=ABCMeta):
 
 
 class DummyContainer(IContainer):
+    __slots__ = ()
+
     async def resolve(self, cls):
         raise NotRegistered()
 
@@ -76,6 +115,8 @@ class DummyContainer(IContainer):
 
 
 class FactoryResolver(TypeFactory):
+    __slots__ = ('type', 'container')
+
     def __init__(self, type, container):
         self.type = type
         self.container = container
@@ -84,71 +125,545 @@ class FactoryResolver(TypeFactory):
         return self.container.resolve(self.type)
 
 
+class SyncFactoryResolver(SyncTypeFactory):
+    __slots__ = ('type', 'container')
+
+    def __init__(self, type, container):
+        self.type = type
+        self.container = container
+
+    def __call__(self):
+        return self.container.resolve_sync(self.type)
+
+
+class LazyResolver(TypeLazy):
+    __slots__ = ('type', 'container', '_value')
+
+    def __init__(self, type, container):
+        self.type = type
+        self.container = container
+        self._value = _PLACEHOLDER
+
+    @property
+    def is_resolved(self):
+        return self._value is not _PLACEHOLDER
+
+    async def __call__(self):
+        if self._value is _PLACEHOLDER:
+            value = await self.container.resolve(self.type)
+            if self._value is _PLACEHOLDER:
+                self._value = value
+        return self._value
+
+
 class Container(IContainer):
-    def __init__(self, proxy_mapping, parent, tag=Tags.SingleInstance):
-        self._cache = {}
+    __slots__ = (
+        '_cache', '_mapping', '_graph', '_pending', '_parent', '_tag', '_lock',
+        '_to_dispose', '_stats', '_root', '_pools', '_borrowed', '_overlay', '_options',
+    )
+
+    def __init__(self, proxy_mapping, parent, tag=Tags.SingleInstance, graph=None, stats=None,
+                 overlay=None, options=_EMPTY):
+        if graph is None:
+            graph = DependencyGraph(proxy_mapping)
+        self._cache = _EMPTY
         self._mapping = proxy_mapping
-        self._alocks = {cls: AsyncLock() for cls in proxy_mapping}
+        self._graph = graph
+        self._pending = None
         self._parent = parent
         self._tag = tag
-        self._lock = Lock()
-        self._to_dispose = []
-
-    def create_nested(self):
-        return Container(self._mapping, self, Tags.Lifetime)
-
-    async def dispose(self, exc=None):
-        for inst in reversed(self._to_dispose):
-            await inst.dispose(exc)
-
-    async def resolve(self, cls):
-        alock = self._alocks.get(cls)
-        if alock is None:
-            raise NotRegistered()
-        async with alock:
-            with self._lock:
-                if cls in self._cache:
-                    return self._cache[cls]
-            proxy = self._mapping[cls]
-            instance = getattr(proxy, 'instance', _PLACEHOLDER)
+        self._lock = None
+        self._to_dispose = None
+        self._stats = stats
+        self._root = self if tag is Tags.SingleInstance else parent._root
+        self._pools = None
+        self._borrowed = None
+        # keys whose singletons live here rather than in the parent, None for plain scopes
+        self._overlay = overlay
+        # build() options applied to registrations added by create_nested(configure)
+        self._options = options
+
+    def _scope_lock(self):
+        lock = self._lock
+        if lock is None:
+            with _LOCK_INIT:
+                lock = self._lock
+                if lock is None:
+                    lock = self._lock = Lock()
+        return lock
+
+    def create_nested(self, configure=None):
+        if configure is None:
+            return Container(self._mapping, self, Tags.Lifetime, self._graph, self._stats,
+                             options=self._options)
+        from pyautofac.builder import ContainerBuilder
+        builder = ContainerBuilder()
+        configure(builder)
+        mapping, graph, overlay = builder.build_overlay(self._mapping, self._graph, **self._options)
+        return Container(mapping, self, Tags.SingleInstance, graph, self._stats, overlay,
+                         self._options)
+
+    async def dispose(self, exc=None, timeout=None):
+        with self._scope_lock():
+            to_dispose, self._to_dispose = self._to_dispose or (), None
+            borrowed, self._borrowed = self._borrowed or (), None
+            pools, self._pools = (self._pools or {}) if self._root is self else {}, None
+        levels = {}
+        for plan, inst in reversed(to_dispose):
+            levels.setdefault(plan.level, []).append((plan, inst))
+        errors = []
+        for level in sorted(levels, reverse=True):
+            results = await gather(*(
+                self._dispose_instance(plan, inst, exc, timeout)
+                for plan, inst in levels[level]
+            ), return_exceptions=True)
+            errors.extend(result for result in results if isinstance(result, BaseException))
+        for pool, inst in reversed(borrowed):
+            try:
+                await pool.give_back(inst)
+            except Exception as error:
+                errors.append(error)
+        for pool in pools.values():
+            try:
+                await pool.close(exc)
+            except Exception as error:
+                errors.append(error)
+        if errors:
+            raise DisposeError(errors)
+
+    async def warm_up(self, parallel=False, concurrency=None):
+        interfaces = {
+            cls for cls, plan in self._mapping.items()
+            if plan.tag is Tags.SingleInstance and not plan.has_instance
+        }
+        timings = {}
+
+        async def warm(cls):
+            start = time.perf_counter()
+            await self.resolve(cls)
+            timings[cls] = time.perf_counter() - start
+
+        order = self._graph.order(interfaces)
+        for cls, plan in self._mapping.items():
+            if plan.tag is Tags.Pooled:
+                await self.pool(cls).fill()
+        if not parallel:
+            for cls in order:
+                await warm(cls)
+            return timings
+
+        if concurrency is not None:
+            semaphore = Semaphore(concurrency)
+            async def limited(cls):
+                async with semaphore:
+                    await warm(cls)
+            await gather(*(limited(cls) for cls in order))
+        else:
+            await gather(*(warm(cls) for cls in order))
+        return timings
+
+    def prepare_fork(self):
+        if self._root is not self:
+            raise RuntimeError('prepare_fork() has to be called on the root container.')
+        gc.collect()
+        if hasattr(gc, 'freeze'):
+            gc.freeze()
+
+    async def after_fork(self):
+        if self._root is not self:
+            raise RuntimeError('after_fork() has to be called on the root container.')
+        # locks inherited from the parent may be held by threads that do not exist here
+        if not hasattr(os, 'register_at_fork'):
+            _reset_lock_init()
+        self._lock = None
+        self._pending = None
+        self._pools = None
+        if self._stats is not None:
+            self._stats._lock = Lock()
+        cache = dict(self._cache)
+        unsafe = [
+            cls for cls, plan in self._mapping.items()
+            if not plan.fork_safe and cls in cache
+        ]
+        rebuild = set()
+        for cls in unsafe:
+            hook = self._mapping[cls].fork_reinitialize
+            if hook is not None:
+                await call_hook(hook, cache[cls])
+            else:
+                rebuild.add(cls)
+        # Lazy and Factory holders keep references too, so every dependency kind counts
+        rebuild |= {cls for cls in self._graph.affected_by(rebuild) if cls in cache}
+        if not rebuild:
+            return unsafe
+        stale = {id(cache.pop(cls)) for cls in rebuild}
+        self._cache = cache
+        # resources inherited from the parent process are dropped, not disposed,
+        # since disposing them could close connections the parent still uses
+        self._to_dispose = [
+            (plan, inst) for plan, inst in self._to_dispose or () if id(inst) not in stale
+        ]
+        for cls in self._graph.order(rebuild):
+            await self.resolve(cls)
+        return unsafe + [cls for cls in self._graph.order(rebuild) if cls not in unsafe]
+
+    async def _dispose_instance(self, plan, inst, exc, timeout):
+        if plan.dispose_timeout is not None:
+            timeout = plan.dispose_timeout
+        stats = self._stats
+        if stats is not None:
+            start = time.perf_counter()
+        try:
+            if timeout is None:
+                await inst.dispose(exc)
+            else:
+                await wait_for(inst.dispose(exc), timeout)
+        finally:
+            if stats is not None:
+                stats.on_dispose(plan.interface, time.perf_counter() - start)
+
+    def resolve(self, cls):
+        return self._resolve(cls, ())
+
+    def resolve_sync(self, cls):
+        return self._resolve_sync(cls, ())
+
+    async def resolve_all(self, types, parallel=False):
+        cache = self._cache
+        mapping = self._mapping
+        stats = self._stats
+        result = []
+        deferred = []
+        for cls in types:
+            instance = cache.get(cls, _PLACEHOLDER)
             if instance is not _PLACEHOLDER:
-                with self._lock:
-                    self._cache[cls] = instance
-                return instance
-
-            type = proxy.registered_type
-            params = get_constructor_params(type)
-            def resolver_builder(param):
-                if issubclass(param, TypeFactory):
-                    def resolver():
-                        fut = Future()
-                        fut.set_result(FactoryResolver(param.SUB_TYPE, self))
-                        return fut
+                if stats is not None:
+                    stats.on_hit(cls)
+            else:
+                plan = mapping.get(cls)
+                if plan is not None and plan.sync:
+                    instance = self._resolve_sync(cls, ())
                 else:
-                    def resolver():
-                        return self.resolve(param)
-                return resolver
-            resolvers = [resolver_builder(param) for param in params]            
-            async def factory():
-                dependencies = []
-                for resolver in resolvers:
-                    dependencies.append(await resolver())
-                instance = type(*dependencies)
-                if isinstance(instance, IAsyncResource):
-                    await instance.initialize()
-                    self._to_dispose.append(instance)
-                return instance
-
-            if proxy.tag is Tags.AlwaysNew:
-                return await factory()
+                    deferred.append((len(result), cls))
+            result.append(instance)
+        if not deferred:
+            return result
+        await self._build_shared({cls for _, cls in deferred}, parallel)
+        if parallel:
+            values = await gather(*(self._resolve(cls, ()) for _, cls in deferred))
+        else:
+            values = []
+            for _, cls in deferred:
+                values.append(await self._resolve(cls, ()))
+        for (index, _), value in zip(deferred, values):
+            result[index] = value
+        return result
+
+    async def _build_shared(self, interfaces, parallel):
+        # walks the dependencies of all requested interfaces once, so that
+        # each shared instance is constructed once before its dependents,
+        # which then find it cached
+        mapping = self._mapping
+        adjacency = self._graph.adjacency
+        cache = self._cache
+        # only plans constructed by this scope are walked through; delegated
+        # singletons and pooled instances get their dependencies elsewhere
+        reachable = set()
+        stack = list(interfaces)
+        while stack:
+            cls = stack.pop()
+            if cls in reachable:
+                continue
+            reachable.add(cls)
+            plan = mapping.get(cls)
+            if plan is None or plan.error is not None or plan.cyclic or plan.has_instance \
+                    or plan.tag is Tags.Pooled or cls in cache or self._delegates(cls, plan):
+                continue
+            stack.extend(adjacency.get(cls, ()))
+        depths = {}
+        waves = []
+        for cls in self._graph.order(reachable):
+            depth = depths[cls] = max(
+                (depths[dependency] + 1 for dependency in adjacency.get(cls, ())
+                 if dependency in depths),
+                default=0)
+            plan = mapping.get(cls)
+            if plan is None or plan.error is not None or plan.cyclic or plan.has_instance \
+                    or plan.tag is Tags.AlwaysNew or plan.tag is Tags.Pooled \
+                    or cls in cache:
+                continue
+            while len(waves) <= depth:
+                waves.append([])
+            waves[depth].append(cls)
+        for wave in waves:
+            if parallel and len(wave) > 1:
+                await gather(*(self._resolve(cls, ()) for cls in wave))
+            else:
+                for cls in wave:
+                    await self._resolve(cls, ())
+
+    def _delegates(self, cls, plan):
+        """Tells whether the instance of `plan` is constructed by the parent scope."""
+        return plan.tag is Tags.SingleInstance and (
+            self._tag is not Tags.SingleInstance
+            or self._overlay is not None and cls not in self._overlay)
+
+    def _get_plan(self, cls, chain):
+        plan = self._mapping.get(cls)
+        if plan is None:
+            raise NotRegistered()
+        if plan.error is not None:
+            _raise_plan_error(plan)
+        if plan.cyclic and cls in chain:
+            path = ' -> '.join(str(item) for item in chain + (cls,))
+            raise CircularDependency('Circular dependency: %s' % path)
+        return plan
+
+    async def _resolve(self, cls, chain):
+        instance = self._cache.get(cls, _PLACEHOLDER)
+        if instance is not _PLACEHOLDER:
+            if self._stats is not None:
+                self._stats.on_hit(cls)
+            return instance
+        plan = self._get_plan(cls, chain)
+        if plan.has_instance:
+            if self._stats is not None:
+                self._stats.on_hit(cls)
+            return plan.instance
+        if plan.sync:
+            return self._resolve_plan_sync(cls, plan, chain)
+
+        if plan.tag is Tags.AlwaysNew:
+            return await self._construct(plan, chain)
+
+        if plan.tag is Tags.Pooled:
+            pool = self._pool_owner(cls)._get_pool(plan)
+            self._check_borrowed(cls, plan, pool)
+            instance = await pool.borrow()
+            with self._scope_lock():
+                if self._borrowed is None:
+                    self._borrowed = []
+                self._borrowed.append((pool, instance))
+            return instance
 
-            if proxy.tag is Tags.SingleInstance and self._tag is not Tags.SingleInstance:
-                return await self._parent.resolve(cls)
+        if plan.tag is Tags.SingleInstance and (
+                self._tag is not Tags.SingleInstance
+                or self._overlay is not None and cls not in self._overlay):
+            return await self._parent._resolve(cls, chain)
 
-            instance = await factory()
-            with self._lock:
-                self._cache[cls] = instance
+        while True:
+            instance, pending, owner = self._claim(cls)
+            if owner:
+                break
+            if pending is None:
+                return instance
+            instance = await self._wait(cls, wrap_future(pending))
+            if instance is not _RETRY:
+                return instance
+        try:
+            instance = await self._construct(plan, chain)
+        except BaseException:
+            self._release(cls, pending, _RETRY)
+            raise
+        self._release(cls, pending, instance)
+        return instance
+
+    def _resolve_sync(self, cls, chain):
+        instance = self._cache.get(cls, _PLACEHOLDER)
+        if instance is not _PLACEHOLDER:
+            if self._stats is not None:
+                self._stats.on_hit(cls)
             return instance
+        plan = self._get_plan(cls, chain)
+        if plan.has_instance:
+            if self._stats is not None:
+                self._stats.on_hit(cls)
+            return plan.instance
+        if not plan.sync:
+            raise NotSyncResolvable('Interface [%s] depends on IAsyncResource, use resolve().' % cls)
+        return self._resolve_plan_sync(cls, plan, chain)
+
+    def _resolve_plan_sync(self, cls, plan, chain):
+        if plan.tag is Tags.AlwaysNew:
+            return self._construct_sync(plan, chain)
+
+        if plan.tag is Tags.SingleInstance and (
+                self._tag is not Tags.SingleInstance
+                or self._overlay is not None and cls not in self._overlay):
+            return self._parent._resolve_sync(cls, chain)
+
+        while True:
+            instance, pending, owner = self._claim(cls)
+            if owner:
+                break
+            if pending is None:
+                return instance
+            instance = self._wait_sync(cls, pending)
+            if instance is not _RETRY:
+                return instance
+        try:
+            instance = self._construct_sync(plan, chain)
+        except BaseException:
+            self._release(cls, pending, _RETRY)
+            raise
+        self._release(cls, pending, instance)
+        return instance
+
+    async def _wait(self, cls, future):
+        if self._stats is None:
+            return await future
+        start = time.perf_counter()
+        instance = await future
+        self._stats.on_wait(cls, time.perf_counter() - start)
+        if instance is not _RETRY:
+            self._stats.on_hit(cls)
+        return instance
+
+    def _wait_sync(self, cls, pending):
+        if self._stats is None:
+            return pending.result()
+        start = time.perf_counter()
+        instance = pending.result()
+        self._stats.on_wait(cls, time.perf_counter() - start)
+        if instance is not _RETRY:
+            self._stats.on_hit(cls)
+        return instance
+
+    def _claim(self, cls):
+        with self._scope_lock():
+            instance = self._cache.get(cls, _PLACEHOLDER)
+            if instance is not _PLACEHOLDER:
+                return instance, None, False
+            if self._pending is None:
+                self._pending = {}
+            pending = self._pending.get(cls)
+            if pending is None:
+                pending = self._pending[cls] = _Pending()
+                return _PLACEHOLDER, pending, True
+            if pending.future is None:
+                pending.future = Future()
+                # running futures cannot be cancelled by waiters that get cancelled
+                pending.future.set_running_or_notify_cancel()
+            return _PLACEHOLDER, pending.future, False
+
+    def _release(self, cls, pending, instance):
+        with self._scope_lock():
+            if instance is not _RETRY:
+                if self._cache is _EMPTY:
+                    self._cache = {}
+                self._cache[cls] = instance
+            del self._pending[cls]
+            future = pending.future
+        if future is not None:
+            future.set_result(instance)
+
+    async def _resolve_dependency(self, dependency, chain):
+        if dependency.kind is DependencyKind.Service:
+            return await self._resolve(dependency.type, chain)
+        return self._create_factory(dependency)
+
+    def _get_pool(self, plan):
+        pool = (self._pools or _EMPTY).get(plan.interface)
+        if pool is None:
+            with self._scope_lock():
+                if self._pools is None:
+                    self._pools = {}
+                pool = self._pools.get(plan.interface)
+                if pool is None:
+                    create = lambda: self._construct(plan, ())
+                    pool = self._pools[plan.interface] = InstancePool(plan.pool_options, create)
+        return pool
+
+    def _check_borrowed(self, cls, plan, pool):
+        # borrowed instances return on dispose, so a scope holding all of
+        # them would wait for itself forever
+        max_size = plan.pool_options.max_size
+        borrowed = self._borrowed
+        if max_size is not None and borrowed is not None and \
+                sum(owner is pool for owner, _ in borrowed) >= max_size:
+            raise PoolExhausted(
+                'Scope already holds all %d pooled instances of [%s]' % (max_size, cls))
+
+    def pool(self, cls):
+        plan = self._mapping.get(cls)
+        if plan is None or plan.tag is not Tags.Pooled:
+            raise NotRegistered('Interface [%s] is not registered as pooled.' % cls)
+        return self._pool_owner(cls)._get_pool(plan)
+
+    def _pool_owner(self, cls):
+        owner = self._root
+        while owner._overlay is not None and cls not in owner._overlay:
+            owner = owner._parent._root
+        return owner
+
+    def _resolve_dependency_sync(self, dependency, chain):
+        if dependency.kind is DependencyKind.Service:
+            return self._resolve_sync(dependency.type, chain)
+        return self._create_factory(dependency)
+
+    def _create_factory(self, dependency):
+        return _RESOLVERS[dependency.kind](dependency.type, self)
+
+    def _construct_sync(self, plan, chain):
+        stats = self._stats
+        if stats is None:
+            return self._create_sync(plan, chain)
+        frame = stats.enter(plan.interface)
+        try:
+            return self._create_sync(plan, chain)
+        finally:
+            stats.exit(frame)
+
+    def _construct(self, plan, chain):
+        if self._stats is None:
+            return self._create(plan, chain)
+        return self._create_measured(plan, chain)
+
+    async def _create_measured(self, plan, chain):
+        stats = self._stats
+        frame = stats.enter(plan.interface)
+        try:
+            return await self._create(plan, chain)
+        finally:
+            stats.exit(frame)
+
+    def _create_sync(self, plan, chain):
+        if plan.compiled is not None and self._stats is None:
+            return plan.compiled(self)
+        if plan.cyclic:
+            chain = chain + (plan.interface,)
+        dependencies = [
+            self._resolve_dependency_sync(dependency, chain)
+            for dependency in plan.dependencies
+        ]
+        return plan.registered_type(*dependencies)
+
+    async def _create(self, plan, chain):
+        if plan.cyclic:
+            chain = chain + (plan.interface,)
+        if plan.parallel and len(plan.dependencies) > 1:
+            dependencies = await gather(*(
+                self._resolve_dependency(dependency, chain)
+                for dependency in plan.dependencies
+            ))
+        else:
+            dependencies = []
+            for dependency in plan.dependencies:
+                dependencies.append(await self._resolve_dependency(dependency, chain))
+        instance = plan.registered_type(*dependencies)
+        if isinstance(instance, IAsyncResource):
+            if self._stats is None:
+                await instance.initialize()
+            else:
+                start = time.perf_counter()
+                await instance.initialize()
+                self._stats.on_initialize(plan.interface, time.perf_counter() - start)
+            if plan.tag is not Tags.Pooled:
+                with self._scope_lock():
+                    if self._to_dispose is None:
+                        self._to_dispose = []
+                    self._to_dispose.append((plan, instance))
+        return instance
 
     def add_instance(self, instance, type=None):
         if type is None:
@@ -157,14 +672,22 @@ class Container(IContainer):
             raise NotSubclass('Object [%s] is not an instance of [%s].' % (instance, type))
         if type in self._mapping:
             raise AlreadyRegistered('Interface [%s] already registered.' % type)
-        with self._lock:
+        with self._scope_lock():
             if type in self._cache:
                 raise AlreadyRegistered('Interface [%s] already registered.' % type)
+            if self._cache is _EMPTY:
+                self._cache = {}
             self._cache[type] = instance
-            self._alocks[type] = AsyncLock()
 
     async def __aenter__(self):
         return self
 
     def __aexit__(self, exc_type, exc, tb):
         return self.dispose(exc)
+
+
+_RESOLVERS = {
+    DependencyKind.Factory: FactoryResolver,
+    DependencyKind.SyncFactory: SyncFactoryResolver,
+    DependencyKind.Lazy: LazyResolver,
+}
@@ -20,3 +20,30 @@ class NotRegistered(PyautofacException):
 
 class NotAnnotatedConstructorParam(PyautofacException):
     pass
+
+
+class CircularDependency(PyautofacException):
+    pass
+
+
+class InvalidRegistration(PyautofacException):
+    """A registration whose plan could not be compiled; the cause is chained."""
+
+    def __init__(self, message, interface, path):
+        super().__init__(message)
+        self.interface = interface
+        self.path = path
+
+
+class NotSyncResolvable(PyautofacException):
+    pass
+
+
+class PoolExhausted(PyautofacException):
+    pass
+
+
+class DisposeError(PyautofacException):
+    def __init__(self, errors):
+        super().__init__('%d resource(s) failed to dispose: %s' % (len(errors), errors))
+        self.errors = errors
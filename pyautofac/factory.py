@@ -2,23 +2,43 @@ from inspect import isclass
 
 
 class TypeFactory:
+    __slots__ = ()
+
+    async def __call__(self):
+        raise NotImplementedError()
+
+
+class SyncTypeFactory(TypeFactory):
+    __slots__ = ()
+
+    def __call__(self):
+        raise NotImplementedError()
+
+
+class TypeLazy:
+    __slots__ = ()
+
     async def __call__(self):
         raise NotImplementedError()
 
 
 _PLACEHOLDER = object()
 class TypeFactoryBuilder:
-    def __init__(self):
+    def __init__(self, base=TypeFactory, name='Factory'):
         self._types = {}
+        self._base = base
+        self._name = name
 
     def __getitem__(self, key):
         if not isclass(key):
             raise KeyError('Key has to be a class')
         cls = self._types.get(key, _PLACEHOLDER)
         if cls is _PLACEHOLDER:
-            cls = type('Factory', (TypeFactory,), {'SUB_TYPE': key})
+            cls = type(self._name, (self._base,), {'SUB_TYPE': key, '__slots__': ()})
             self._types[key] = cls
         return cls
 
 
 Factory = TypeFactoryBuilder()
+SyncFactory = TypeFactoryBuilder(SyncTypeFactory, 'SyncFactory')
+Lazy = TypeFactoryBuilder(TypeLazy, 'Lazy')
@@ -5,6 +5,7 @@ class Tags(Enum):
     SingleInstance = 1
     Lifetime = 2
     AlwaysNew = 3
+    Pooled = 4
 
 _LTE_MAP = {
     (Tags.AlwaysNew, Tags.SingleInstance),
@@ -14,3 +15,10 @@ _LTE_MAP = {
 
 def lte(tag1, tag2):
     return (tag1, tag2) in _LTE_MAP
+
+
+class DependencyKind(Enum):
+    Service = 1
+    Factory = 2
+    SyncFactory = 3
+    Lazy = 4
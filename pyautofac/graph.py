@@ -0,0 +1,216 @@
+from pyautofac.exceptions import (
+    CircularDependency, InvalidRegistration, NotRegistered, NotSyncResolvable,
+)
+from pyautofac.globals import DependencyKind, Tags
+
+
+def _format_path(path):
+    return ' -> '.join(getattr(item, '__name__', str(item)) for item in path)
+
+
+def _service_dependencies(plan):
+    return tuple(
+        dependency.type for dependency in plan.dependencies
+        if dependency.kind is DependencyKind.Service
+    )
+
+
+class DependencyGraph:
+    def __init__(self, plans, base=None, changed=None):
+        """Indexes `plans`. When `base` is given only the `changed` interfaces
+        (which must include everything depending on them) are recomputed and
+        the rest of the indices is shared with `base` copy-on-write."""
+        self._plans = plans
+        self._referrers = None
+        if base is None:
+            changed = None
+            self.adjacency = {
+                interface: _service_dependencies(plan) for interface, plan in plans.items()
+            }
+            self.dependents = {}
+            for interface, dependencies in self.adjacency.items():
+                for dependency in dependencies:
+                    self.dependents.setdefault(dependency, []).append(interface)
+        else:
+            self.adjacency = dict(base.adjacency)
+            self.dependents = dict(base.dependents)
+            copied = set()
+            for interface in changed:
+                old = self.adjacency.get(interface, ())
+                new = self.adjacency[interface] = _service_dependencies(plans[interface])
+                for dependency in set(old).symmetric_difference(new):
+                    if dependency not in copied:
+                        copied.add(dependency)
+                        self.dependents[dependency] = list(self.dependents.get(dependency, ()))
+                    if dependency in new:
+                        self.dependents[dependency].append(interface)
+                    else:
+                        self.dependents[dependency].remove(interface)
+        roots = plans if changed is None else changed
+        self.cyclic = self._find_cyclic(roots, base)
+        for interface in roots:
+            plan = plans[interface]
+            plan.cyclic = interface in self.cyclic
+            if plan.cyclic:
+                plan.parallel = False
+        self._assign_levels(roots)
+        self._assign_sync(roots)
+
+    def _find_cyclic(self, roots, base):
+        adjacency = self.adjacency
+        # cycles only run through interfaces that depend on each other, so
+        # the ones found in `base` outside of `roots` are still valid
+        result = set() if base is None else base.cyclic.difference(roots)
+        done = set()
+        stack = []
+
+        def visit(interface):
+            if interface in stack:
+                result.update(stack[stack.index(interface):])
+                return
+            if interface in done or interface not in adjacency:
+                return
+            if base is not None and interface not in roots:
+                return
+            stack.append(interface)
+            for dependency in adjacency[interface]:
+                visit(dependency)
+                if dependency in result:
+                    result.add(interface)
+            stack.pop()
+            done.add(interface)
+
+        for interface in roots:
+            visit(interface)
+        return result
+
+    def _assign_levels(self, roots):
+        plans = self._plans
+        levels = {}
+
+        def visit(interface):
+            level = levels.get(interface)
+            if level is not None:
+                return level
+            plan = plans.get(interface)
+            if plan is None:
+                return 0
+            if interface not in roots:
+                return plan.level
+            levels[interface] = 0  # guards against cycles
+            level = max((visit(dependency.type) for dependency in plan.dependencies), default=0)
+            if plan.disposable:
+                level += 1
+            plan.level = levels[interface] = level
+            return level
+
+        for interface in roots:
+            visit(interface)
+
+    def _assign_sync(self, roots):
+        plans = self._plans
+        states = {}
+
+        def visit(interface):
+            state = states.get(interface)
+            if state is not None:
+                return state
+            plan = plans.get(interface)
+            if plan is None:
+                return True
+            if interface not in roots:
+                return plan.sync
+            states[interface] = True  # cycles are reported at runtime
+            if plan.has_instance:
+                sync = True
+            else:
+                sync = (
+                    plan.error is None and not plan.disposable and plan.tag is not Tags.Pooled
+                    and all(
+                        visit(dependency.type) for dependency in plan.dependencies
+                        if dependency.kind is DependencyKind.Service
+                    )
+                )
+            plan.sync = states[interface] = sync
+            return sync
+
+        for interface in roots:
+            visit(interface)
+
+    def order(self, interfaces):
+        """Returns `interfaces` sorted so that every interface follows its
+        service dependencies."""
+        adjacency = self.adjacency
+        result = []
+        seen = set()
+
+        def visit(interface):
+            if interface in seen:
+                return
+            seen.add(interface)
+            for dependency in adjacency.get(interface, ()):
+                visit(dependency)
+            if interface in interfaces:
+                result.append(interface)
+
+        for interface in interfaces:
+            visit(interface)
+        return result
+
+    def affected_by(self, interfaces):
+        """Returns interfaces that reach any of `interfaces` through any kind of dependency."""
+        referrers = self._referrers
+        if referrers is None:
+            referrers = {}
+            for interface, plan in self._plans.items():
+                for dependency in plan.dependencies:
+                    referrers.setdefault(dependency.type, []).append(interface)
+            self._referrers = referrers
+        result = set()
+        stack = list(interfaces)
+        while stack:
+            interface = stack.pop()
+            for referrer in referrers.get(interface, ()):
+                if referrer not in result:
+                    result.add(referrer)
+                    stack.append(referrer)
+        return result
+
+    def validate(self):
+        plans = self._plans
+        done = set()
+        stack = []
+
+        def visit(interface):
+            if interface in stack:
+                cycle = stack[stack.index(interface):] + [interface]
+                raise CircularDependency('Circular dependency: %s' % _format_path(cycle))
+            if interface in done:
+                return
+            stack.append(interface)
+            plan = plans.get(interface)
+            if plan is None:
+                raise NotRegistered('Interface [%s] is not registered (required by %s)'
+                                    % (interface, _format_path(stack[:-1])))
+            if plan.error is not None:
+                raise InvalidRegistration(
+                    '%s: %s (in %s)' % (type(plan.error).__name__, plan.error, _format_path(stack)),
+                    interface, tuple(stack)) from plan.error
+            for dependency in plan.dependencies:
+                if dependency.kind is DependencyKind.Service:
+                    visit(dependency.type)
+                elif dependency.type not in plans:
+                    raise NotRegistered('Interface [%s] is not registered (required by factory in %s)'
+                                        % (dependency.type, _format_path(stack)))
+                elif dependency.kind is DependencyKind.SyncFactory:
+                    target = plans[dependency.type]
+                    if not target.sync and target.error is None:
+                        raise NotSyncResolvable(
+                            'Interface [%s] depends on IAsyncResource, use Factory '
+                            '(required by SyncFactory in %s)'
+                            % (dependency.type, _format_path(stack)))
+            stack.pop()
+            done.add(interface)
+
+        for interface in plans:
+            visit(interface)
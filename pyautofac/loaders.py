@@ -0,0 +1,285 @@
+"""Streaming configuration file loaders.
+
+The loaders read a file in chunks and produce the flat `{'a:b': 'value'}`
+mapping directly, without building the nested document first. Only arrays
+(which are stored as a single value) are materialized as a whole. Unlike
+loading the whole document, an object repeated under the same key is
+merged with the earlier one instead of replacing it.
+"""
+import json
+import re
+from json.decoder import scanstring
+from json.scanner import make_scanner
+
+from pyautofac.configuration import _NESTING_SEPARATOR
+
+_CHUNK_SIZE = 1 << 16
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# a key with an optional plain value and the delimiter following it
+_PAIR = re.compile(
+    r'[ \t\n\r]*"([^"\\]*)"[ \t\n\r]*:[ \t\n\r]*'
+    r'(?:(?:"([^"\\]*)"|(-?[1-9][0-9]*|0|true|false|null))[ \t\n\r]*([,}]))?')
+_LITERALS = {'true': 'True', 'false': 'False', 'null': 'None'}
+_DELIMITERS = frozenset(' \t\n\r,}]')
+_MAP_TAG = 'tag:yaml.org,2002:map'
+_MERGE_TAG = 'tag:yaml.org,2002:merge'
+
+
+class _JsonStream:
+    __slots__ = ('_fo', 'buffer', 'pos', '_eof', 'scan')
+
+    def __init__(self, fo):
+        self._fo = fo
+        self.buffer = ''
+        self.pos = 0
+        self._eof = False
+        self.scan = make_scanner(json.JSONDecoder())
+
+    def _fill(self):
+        if self._eof:
+            return False
+        # grow reads with the pending data, so that retrying a long token stays linear
+        chunk = self._fo.read(max(_CHUNK_SIZE, len(self.buffer) - self.pos))
+        if not chunk:
+            self._eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message):
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self):
+        """Skips whitespace and returns the next character, '' at the end of input."""
+        while True:
+            pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            self.pos = pos
+            if pos < len(self.buffer):
+                return self.buffer[pos]
+            if not self._fill():
+                return ''
+
+    def key(self):
+        if self.peek() != '"':
+            raise self.error('Expecting property name enclosed in double quotes')
+        while True:
+            try:
+                key, end = scanstring(self.buffer, self.pos + 1)
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            self.pos = end
+            if self.peek() != ':':
+                raise self.error("Expecting ':' delimiter")
+            self.pos += 1
+            return key
+
+    def value(self):
+        """Decodes the scalar or array starting at the current position."""
+        while True:
+            try:
+                value, end = self.scan(self.buffer, self.pos)
+            except StopIteration:
+                if self._fill():
+                    continue
+                raise self.error('Expecting value') from None
+            except json.JSONDecodeError:
+                if self._fill():
+                    continue
+                raise
+            # a token is complete only when followed by a delimiter, e.g. a
+            # number cut by the end of the buffer may continue in the next chunk
+            if (end == len(self.buffer) or self.buffer[end] not in _DELIMITERS) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def flatten_json(fo):
+    """Reads a JSON object from `fo` into a flat mapping of strings."""
+    stream = _JsonStream(fo)
+    if stream.peek() != '{':
+        stream.value()
+        raise TypeError('dct is not a dict')
+    stream.pos += 1
+    scan = stream.scan
+    result = {}
+    # prefixes of the enclosing objects
+    stack = []
+    prefix = ''
+    char = stream.peek()
+    if char == '}':
+        stream.pos += 1
+    while char != '}':
+        # fast paths work on the buffer directly, the stream methods handle
+        # escapes, tokens cut by the end of a chunk and errors
+        buffer = stream.buffer
+        match = _PAIR.match(buffer, stream.pos)
+        if match is not None and match.group(4) is not None:
+            # a plain string or literal value followed by its delimiter
+            value = match.group(2)
+            if value is None:
+                value = match.group(3)
+                value = _LITERALS.get(value, value)
+            result[prefix + match.group(1)] = value
+            if match.group(4) == ',':
+                stream.pos = match.end()
+                continue
+            stream.pos = match.end() - 1
+        else:
+            if match is not None and match.end() < len(buffer):
+                key = prefix + match.group(1)
+                pos = stream.pos = match.end()
+                char = buffer[pos]
+            else:
+                key = prefix + stream.key()
+                char = stream.peek()
+                buffer, pos = stream.buffer, stream.pos
+            if char == '{':
+                stream.pos += 1
+                if stream.peek() != '}':
+                    stack.append(prefix)
+                    prefix = key + _NESTING_SEPARATOR
+                    continue
+                # empty objects have no keys
+                stream.pos += 1
+            else:
+                try:
+                    value, end = scan(buffer, pos)
+                except (StopIteration, ValueError):
+                    end = len(buffer)
+                if end < len(buffer) and buffer[end] in _DELIMITERS:
+                    stream.pos = end
+                else:
+                    value = stream.value()
+                result[key] = str(value)
+        char = stream.peek()
+        while char == '}' and stack:
+            stream.pos += 1
+            prefix = stack.pop()
+            char = stream.peek()
+        if char == ',':
+            stream.pos += 1
+        elif char != '}':
+            raise stream.error("Expecting ',' delimiter")
+        else:
+            stream.pos += 1
+    if stream.peek():
+        raise stream.error('Extra data')
+    return result
+
+
+def flatten_yaml(fo, loader_class):
+    """Reads a YAML mapping from `fo` into a flat mapping of strings.
+
+    Mappings are walked event by event. Sequences, anchored nodes and the
+    entries of a mapping from its `<<` key on are composed and constructed
+    by the loader, so tags, aliases and merges behave as in `yaml.load`.
+    """
+    from yaml import events
+    from yaml.composer import ComposerError
+    from yaml.nodes import MappingNode, ScalarNode, SequenceNode
+
+    loader = loader_class(fo)
+    anchors = {}
+
+    def compose():
+        event = loader.get_event()
+        if isinstance(event, events.AliasEvent):
+            return anchors[event.anchor]
+        if isinstance(event, events.ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(ScalarNode, event.value, event.implicit)
+            node = ScalarNode(tag, event.value, event.start_mark, event.end_mark, event.style)
+        elif isinstance(event, events.SequenceStartEvent):
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(SequenceNode, None, event.implicit)
+            node = SequenceNode(tag, [], event.start_mark, None, event.flow_style)
+            if event.anchor is not None:
+                anchors[event.anchor] = node
+            while not loader.check_event(events.SequenceEndEvent):
+                node.value.append(compose())
+            node.end_mark = loader.get_event().end_mark
+            return node
+        else:
+            tag = event.tag
+            if tag is None or tag == '!':
+                tag = loader.resolve(MappingNode, None, event.implicit)
+            node = MappingNode(tag, [], event.start_mark, None, event.flow_style)
+            if event.anchor is not None:
+                anchors[event.anchor] = node
+            while not loader.check_event(events.MappingEndEvent):
+                node.value.append((compose(), compose()))
+            node.end_mark = loader.get_event().end_mark
+            return node
+        if event.anchor is not None:
+            anchors[event.anchor] = node
+        return node
+
+    def construct(node):
+        value = loader.construct_object(node, deep=True)
+        loader.constructed_objects.clear()
+        return value
+
+    def add(result, prefix, value):
+        if isinstance(value, dict):
+            for key, item in value.items():
+                add(result, prefix + _NESTING_SEPARATOR + key, item)
+        else:
+            result[prefix] = str(value)
+
+    def walk(result, prefix):
+        # the MappingStartEvent has been consumed
+        seen = set()
+        while not loader.check_event(events.MappingEndEvent):
+            key_node = compose()
+            if key_node.tag == _MERGE_TAG:
+                # explicit keys win over merged ones, wherever they appear
+                pairs = [(key_node, compose())]
+                while not loader.check_event(events.MappingEndEvent):
+                    pairs.append((compose(), compose()))
+                merged = construct(MappingNode(_MAP_TAG, pairs, key_node.start_mark, None))
+                for key, item in merged.items():
+                    if key not in seen:
+                        add(result, prefix + key, item)
+                break
+            key = construct(key_node)
+            seen.add(key)
+            key = prefix + key
+            event = loader.peek_event()
+            if isinstance(event, events.MappingStartEvent) and event.anchor is None \
+                    and event.tag in (None, '!', _MAP_TAG):
+                loader.get_event()
+                walk(result, key + _NESTING_SEPARATOR)
+            else:
+                add(result, key, construct(compose()))
+        loader.get_event()
+
+    try:
+        loader.get_event()  # StreamStartEvent
+        if loader.check_event(events.StreamEndEvent):
+            raise TypeError('dct is not a dict')
+        loader.get_event()  # DocumentStartEvent
+        event = loader.peek_event()
+        if not isinstance(event, events.MappingStartEvent):
+            construct(compose())
+            raise TypeError('dct is not a dict')
+        result = {}
+        if event.anchor is None:
+            loader.get_event()
+            walk(result, '')
+        else:
+            for key, item in construct(compose()).items():
+                add(result, key, item)
+        loader.get_event()  # DocumentEndEvent
+        if not loader.check_event(events.StreamEndEvent):
+            raise ComposerError(
+                'expected a single document in the stream', event.start_mark,
+                'but found another document', loader.get_event().start_mark)
+        return result
+    finally:
+        loader.dispose()
@@ -0,0 +1,155 @@
+import json
+import os
+import sys
+from typing import List
+
+from pyautofac.globals import DependencyKind
+from pyautofac.plan import Dependency, collection_item
+
+
+_FORMAT = 2
+
+
+def _lookup(reference):
+    module, _, qualname = reference.partition(':')
+    # never imports anything: a class can only be reached from the cache file
+    # when its module has already been imported by the application
+    obj = sys.modules.get(module)
+    for part in qualname.split('.'):
+        if obj is None:
+            return None
+        obj = getattr(obj, part, None)
+    return obj
+
+
+def _reference(obj):
+    module = getattr(obj, '__module__', None)
+    qualname = getattr(obj, '__qualname__', None)
+    if not isinstance(module, str) or not isinstance(qualname, str) or '<' in qualname:
+        return None
+    reference = '%s:%s' % (module, qualname)
+    if _lookup(reference) is not obj:
+        return None
+    return reference
+
+
+def _modules(cls):
+    """Modules whose changes can alter the constructor of `cls`.
+
+    These are the modules of the classes in the MRO up to the one defining
+    `__init__`, plus the module of the `__init__` function itself.
+    """
+    modules = []
+    for klass in cls.__mro__:
+        if klass is object:
+            break
+        modules.append(klass.__module__)
+        if '__init__' in vars(klass):
+            break
+    modules.append(getattr(cls.__init__, '__module__', None))
+    return [module for module in dict.fromkeys(modules) if module is not None]
+
+
+class MetadataCache:
+    """Persists constructor dependencies of registered classes.
+
+    Entries are stamped with the mtime and size of every module that can
+    change the class constructor (see `_modules`) and are ignored once any
+    of them changes. Classes that cannot be found by module and qualified
+    name (local or generated classes) are always inspected.
+    """
+
+    __slots__ = ('path', 'hits', 'misses', '_entries', '_stamps', '_types', '_dirty')
+
+    def __init__(self, path):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = self._load()
+        self._stamps = {}
+        self._types = {}
+        self._dirty = False
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as fo:
+                data = json.load(fo)
+            if data['format'] != _FORMAT:
+                return {}
+            return dict(data['classes'])
+        except (OSError, ValueError, KeyError, TypeError):
+            return {}
+
+    def _module_stamp(self, module):
+        stamp = self._stamps.get(module)
+        if stamp is None and module not in self._stamps:
+            path = getattr(sys.modules.get(module), '__file__', None)
+            try:
+                stat = os.stat(path)
+                stamp = [module, stat.st_mtime_ns, stat.st_size]
+            except (OSError, TypeError):
+                stamp = None
+            self._stamps[module] = stamp
+        return stamp
+
+    def _stamp(self, cls):
+        stamps = []
+        for module in _modules(cls):
+            stamp = self._module_stamp(module)
+            if stamp is None:
+                return None
+            stamps.append(stamp)
+        return stamps
+
+    def get(self, cls):
+        reference = _reference(cls)
+        entry = self._entries.get(reference) if reference is not None else None
+        if entry is None or entry['stamp'] != self._stamp(cls):
+            self.misses += 1
+            return None
+        dependencies = []
+        types = self._types
+        for kind, collection, type_reference in entry['dependencies']:
+            type = types.get(type_reference)
+            if type is None:
+                type = types[type_reference] = _lookup(type_reference)
+            if type is None:
+                self.misses += 1
+                return None
+            if collection:
+                type = List[type]
+            dependencies.append(Dependency(DependencyKind[kind], type))
+        self.hits += 1
+        return tuple(dependencies)
+
+    def put(self, cls, dependencies):
+        reference = _reference(cls)
+        stamp = self._stamp(cls) if reference is not None else None
+        if stamp is None:
+            return
+        encoded = []
+        for dependency in dependencies:
+            item = collection_item(dependency.type)
+            type_reference = _reference(dependency.type if item is None else item)
+            if type_reference is None:
+                return
+            encoded.append([dependency.kind.name, item is not None, type_reference])
+        self._entries[reference] = {'stamp': stamp, 'dependencies': encoded}
+        self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp = '%s.%d.tmp' % (self.path, os.getpid())
+        try:
+            with open(tmp, 'w') as fo:
+                json.dump({'format': _FORMAT, 'classes': self._entries}, fo)
+            os.replace(tmp, self.path)
+        except OSError:
+            # the cache is an optimization, an unwritable location only disables it
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            return
+        self._dirty = False
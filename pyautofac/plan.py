@@ -0,0 +1,157 @@
+import inspect
+from typing import List
+
+from pyautofac.async_resource import IAsyncResource
+from pyautofac.exceptions import NotAnnotatedConstructorParam
+from pyautofac.factory import SyncTypeFactory, TypeFactory, TypeLazy
+from pyautofac.globals import DependencyKind, Tags
+
+
+_PLACEHOLDER = object()
+
+def get_constructor_params(cls):
+    ctr = cls.__init__
+    try:
+        ann = ctr.__annotations__
+    except AttributeError:
+        return
+    params = inspect.signature(ctr).parameters
+    iter_params = iter(params)
+    next(iter_params)  # ignore self
+    for p in iter_params:
+        if p not in ann:
+            raise NotAnnotatedConstructorParam(p)
+        yield ann[p]
+
+
+class Dependency:
+    __slots__ = ('kind', 'type')
+
+    def __init__(self, kind, type):
+        self.kind = kind
+        self.type = type
+
+
+class ResolutionPlan:
+    __slots__ = (
+        'interface', 'registered_type', 'tag', 'dependencies', 'instance', 'error',
+        'parallel', 'dispose_timeout', 'pool_options', 'disposable', 'level', 'cyclic', 'sync',
+        'compiled', 'fork_safe', 'fork_reinitialize',
+    )
+
+    def __init__(self, interface, registered_type, tag,
+                 dependencies=(), instance=_PLACEHOLDER, error=None, parallel=False,
+                 dispose_timeout=None, pool_options=None, fork_safe=True,
+                 fork_reinitialize=None):
+        self.interface = interface
+        self.registered_type = registered_type
+        self.tag = tag
+        self.dependencies = dependencies
+        self.instance = instance
+        self.error = error
+        self.parallel = parallel
+        self.dispose_timeout = dispose_timeout
+        self.pool_options = pool_options
+        self.disposable = (
+            instance is _PLACEHOLDER and error is None
+            and issubclass(registered_type, IAsyncResource)
+        )
+        self.level = 0
+        self.cyclic = False
+        self.sync = False
+        self.compiled = None
+        self.fork_safe = fork_safe
+        self.fork_reinitialize = fork_reinitialize
+
+    @property
+    def has_instance(self):
+        return self.instance is not _PLACEHOLDER
+
+    def copy(self):
+        plan = ResolutionPlan.__new__(ResolutionPlan)
+        for name in ResolutionPlan.__slots__:
+            setattr(plan, name, getattr(self, name))
+        plan.compiled = None
+        return plan
+
+
+class Registration:
+    """Plan key of an additional registration of an interface."""
+    __slots__ = ('interface', 'index')
+
+    def __init__(self, interface, index):
+        self.interface = interface
+        self.index = index
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, Registration)
+            and self.interface is other.interface and self.index == other.index
+        )
+
+    def __hash__(self):
+        return hash((self.interface, self.index))
+
+    def __repr__(self):
+        return '%s#%d' % (getattr(self.interface, '__name__', self.interface), self.index)
+
+
+class Collection(list):
+    __slots__ = ()
+
+    def __init__(self, *items):
+        super().__init__(items)
+
+
+def collection_item(param):
+    """Returns T for a List[T] annotation, None otherwise."""
+    if getattr(param, '__origin__', None) not in (list, List):
+        return None
+    args = getattr(param, '__args__', None)
+    return args[0] if args else None
+
+
+def compile_dependency(param):
+    if collection_item(param) is not None:
+        return Dependency(DependencyKind.Service, param)
+    if issubclass(param, TypeLazy):
+        return Dependency(DependencyKind.Lazy, param.SUB_TYPE)
+    if issubclass(param, SyncTypeFactory):
+        return Dependency(DependencyKind.SyncFactory, param.SUB_TYPE)
+    if issubclass(param, TypeFactory):
+        return Dependency(DependencyKind.Factory, param.SUB_TYPE)
+    return Dependency(DependencyKind.Service, param)
+
+
+def compile_plan(proxy, parallel=False, metadata=None):
+    instance = getattr(proxy, 'instance', _PLACEHOLDER)
+    if instance is not _PLACEHOLDER:
+        return ResolutionPlan(proxy.interface, proxy.registered_type, proxy.lifetime, instance=instance)
+    try:
+        dependencies = None if metadata is None else metadata.get(proxy.registered_type)
+        if dependencies is None:
+            params = get_constructor_params(proxy.registered_type)
+            dependencies = tuple(compile_dependency(param) for param in params)
+            if metadata is not None:
+                metadata.put(proxy.registered_type, dependencies)
+    except Exception as exc:
+        return ResolutionPlan(proxy.interface, proxy.registered_type, proxy.lifetime, error=exc)
+    parallel = parallel or proxy.parallel
+    return ResolutionPlan(proxy.interface, proxy.registered_type, proxy.lifetime, dependencies,
+                          parallel=parallel, dispose_timeout=proxy.dispose_timeout,
+                          pool_options=proxy.pool_options, fork_safe=proxy.fork_safe,
+                          fork_reinitialize=proxy.fork_reinitialize)
+
+
+def _collection_tag(members):
+    tags = {Tags.SingleInstance if plan.has_instance else plan.tag for plan in members}
+    if tags <= {Tags.SingleInstance}:
+        return Tags.SingleInstance
+    if tags & {Tags.AlwaysNew, Tags.Pooled}:
+        return Tags.AlwaysNew
+    return Tags.Lifetime
+
+
+def compile_collection_plan(item, keys, members):
+    dependencies = tuple(Dependency(DependencyKind.Service, key) for key in keys)
+    return ResolutionPlan(List[item], Collection, _collection_tag(members), dependencies)
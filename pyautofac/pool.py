@@ -0,0 +1,179 @@
+import inspect
+from asyncio import CancelledError, wrap_future
+from collections import deque
+from concurrent.futures import Future
+from threading import Lock
+
+from pyautofac.async_resource import IAsyncResource
+
+
+_RETRY = object()
+
+async def call_hook(hook, instance):
+    result = hook(instance)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+class PoolOptions:
+    def __init__(self, min_size=0, max_size=None, reset=None, evict=None):
+        if min_size < 0 or (max_size is not None and max_size < max(min_size, 1)):
+            raise ValueError('Invalid pool size: min_size=%s, max_size=%s' % (min_size, max_size))
+        self.min_size = min_size
+        self.max_size = max_size
+        self.reset = reset
+        self.evict = evict
+
+
+class InstancePool:
+    def __init__(self, options, create):
+        self._options = options
+        self._create = create
+        self._lock = Lock()
+        self._idle = deque()
+        self._waiters = deque()
+        self._filled = False
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.waits = 0
+        self.evictions = 0
+
+    @property
+    def idle(self):
+        return len(self._idle)
+
+    def to_dict(self):
+        return {
+            'size': self.size,
+            'idle': self.idle,
+            'hits': self.hits,
+            'misses': self.misses,
+            'waits': self.waits,
+            'evictions': self.evictions,
+        }
+
+    async def fill(self):
+        with self._lock:
+            self._filled = True
+            missing = self._options.min_size - self.size
+            self.size += max(missing, 0)
+        for created in range(missing):
+            try:
+                instance = await self._create()
+            except BaseException:
+                # free every slot reserved above and let a later borrow fill again
+                with self._lock:
+                    self._filled = False
+                for _ in range(missing - created):
+                    self._discard()
+                raise
+            self._put(instance)
+
+    async def borrow(self):
+        if not self._filled:
+            await self.fill()
+        max_size = self._options.max_size
+        while True:
+            with self._lock:
+                if self._idle:
+                    self.hits += 1
+                    return self._idle.pop()
+                if max_size is None or self.size < max_size:
+                    self.size += 1
+                    self.misses += 1
+                    waiter = None
+                else:
+                    self.waits += 1
+                    waiter = Future()
+                    waiter.set_running_or_notify_cancel()
+                    self._waiters.append(waiter)
+            if waiter is None:
+                try:
+                    return await self._create()
+                except BaseException:
+                    self._discard()
+                    raise
+            try:
+                instance = await wrap_future(waiter)
+            except CancelledError:
+                self._abandon(waiter)
+                raise
+            if instance is not _RETRY:
+                return instance
+
+    async def give_back(self, instance):
+        options = self._options
+        try:
+            if options.reset is not None:
+                await call_hook(options.reset, instance)
+            evict = options.evict is not None and await call_hook(options.evict, instance)
+        except BaseException:
+            await self._evict(instance)
+            raise
+        if evict:
+            await self._evict(instance)
+        else:
+            self._put(instance)
+
+    async def close(self, exc=None):
+        with self._lock:
+            idle, self._idle = list(self._idle), deque()
+            self.size -= len(idle)
+        for instance in idle:
+            if isinstance(instance, IAsyncResource):
+                await instance.dispose(exc)
+
+    async def _evict(self, instance):
+        with self._lock:
+            self.evictions += 1
+        self._discard()
+        if isinstance(instance, IAsyncResource):
+            await instance.dispose()
+
+    def _put(self, instance):
+        with self._lock:
+            waiter = self._next_waiter()
+            if waiter is None:
+                self._idle.append(instance)
+                return
+        waiter.set_result(instance)
+
+    def _discard(self):
+        with self._lock:
+            self.size -= 1
+        self._wake()
+
+    def _wake(self):
+        # a slot became free: the next waiter retries borrowing
+        with self._lock:
+            waiter = self._next_waiter()
+        if waiter is not None:
+            waiter.set_result(_RETRY)
+
+    def _next_waiter(self):
+        # called with the lock held; abandoned waiters are skipped
+        waiters = self._waiters
+        while waiters:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                return waiter
+        return None
+
+    def _abandon(self, waiter):
+        with self._lock:
+            try:
+                self._waiters.remove(waiter)
+                return
+            except ValueError:
+                pass
+        # _put or _discard already picked this waiter: pass its result on
+        waiter.add_done_callback(self._reclaim)
+
+    def _reclaim(self, waiter):
+        instance = waiter.result()
+        if instance is _RETRY:
+            self._wake()
+        else:
+            self._put(instance)
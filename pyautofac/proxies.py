@@ -1,13 +1,71 @@
+import warnings
 from inspect import isclass
 
 from pyautofac.exceptions import NotClass, NotSubclass
 from pyautofac.globals import Tags
+from pyautofac.pool import PoolOptions
+
+
+class _TagAlias:
+    """Value of the deprecated `proxy.tag` attribute.
+
+    Reads behave like the lifetime (with a DeprecationWarning); calling it
+    is the documented `.tag(Tags.X)` method.
+    """
+    __slots__ = ('_proxy',)
+
+    def __init__(self, proxy):
+        self._proxy = proxy
+
+    def __call__(self, obj):
+        assert isinstance(obj, Tags)
+        self._proxy.lifetime = obj
+        return self._proxy
+
+    def _lifetime(self):
+        warnings.warn('BuilderProxy.tag is deprecated, use .lifetime instead',
+                      DeprecationWarning, stacklevel=3)
+        return self._proxy.lifetime
+
+    def __eq__(self, other):
+        return self._lifetime() == other
+
+    def __hash__(self):
+        return hash(self._lifetime())
+
+    def __getattr__(self, name):
+        return getattr(self._lifetime(), name)
+
+    def __repr__(self):
+        return repr(self._proxy.lifetime)
+
+
+class _Tag:
+    def __get__(self, proxy, owner=None):
+        return self if proxy is None else _TagAlias(proxy)
+
+    def __set__(self, proxy, value):
+        warnings.warn('BuilderProxy.tag is deprecated, use .lifetime instead',
+                      DeprecationWarning, stacklevel=2)
+        assert isinstance(value, Tags)
+        proxy.lifetime = value
 
 
 class BuilderProxy:
+    __slots__ = (
+        'lifetime', 'overwrite', 'parallel', 'dispose_timeout', 'pool_options',
+        'registered_type', 'interface', 'fork_safe', 'fork_reinitialize', 'multiple',
+    )
+
     def __init__(self):
-        self.tag = Tags.AlwaysNew
+        self.lifetime = Tags.AlwaysNew
         self.overwrite = False
+        self.parallel = False
+        self.dispose_timeout = None
+        self.pool_options = None
+        self.fork_safe = True
+        self.fork_reinitialize = None
+        self.multiple = False
 
     def as_interface(self, interface):
         if not isclass(interface):
@@ -21,36 +79,60 @@ class BuilderProxy:
         self.interface = self.registered_type
         return self
 
-    def tag(self, obj):
-        assert isinstance(obj, Tags)
-        self.tag = obj
-        return self
+    # lifetime used to be stored in `tag`, which also shadowed the tag() method
+    tag = _Tag()
 
     def single_instance(self):
-        self.tag = Tags.SingleInstance
+        self.lifetime = Tags.SingleInstance
         return self
 
     def per_lifetime(self):
-        self.tag = Tags.Lifetime
+        self.lifetime = Tags.Lifetime
         return self
 
     def always_new(self):
-        self.tag = Tags.AlwaysNew
+        self.lifetime = Tags.AlwaysNew
+        return self
+
+    def pooled(self, min_size=0, max_size=None, reset=None, evict=None):
+        self.lifetime = Tags.Pooled
+        self.pool_options = PoolOptions(min_size, max_size, reset, evict)
+        return self
+
+    def fork_unsafe(self, reinitialize=None):
+        self.fork_safe = False
+        self.fork_reinitialize = reinitialize
         return self
 
     def overwrite_registered(self):
         self.overwrite = True
         return self
 
+    def allow_multiple(self):
+        self.multiple = True
+        return self
+
+    def parallel_dependencies(self):
+        self.parallel = True
+        return self
+
+    def with_dispose_timeout(self, timeout):
+        self.dispose_timeout = timeout
+        return self
+
 
 class ClassProxy(BuilderProxy):
+    __slots__ = ()
+
     def __init__(self, cls):
         super().__init__()
         self.registered_type = cls
-        self.interface = cls  
+        self.interface = cls
 
 
 class InstanceProxy(BuilderProxy):
+    __slots__ = ('instance',)
+
     def __init__(self, instance):
         super().__init__()
         self.instance = instance
@@ -68,3 +150,6 @@ class InstanceProxy(BuilderProxy):
 
     def always_new(self):
         raise NotImplementedError()
+
+    def pooled(self, min_size=0, max_size=None, reset=None, evict=None):
+        raise NotImplementedError()
@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import os
+import sys
+from threading import Lock
+
+from pyautofac.configuration import (
+    _NESTING_SEPARATOR, _PLACEHOLDER, DictConfiguration, IConfiguration, _FileSource,
+    _update_index,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class _Inotify:
+    # IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    MASK = 0x2 | 0x8 | 0x40 | 0x80 | 0x100 | 0x200
+
+    def __init__(self, fd):
+        self.fd = fd
+        self.complete = True
+
+    @classmethod
+    def create(cls, paths):
+        """Watches the directories of `paths`, returns None where inotify is unavailable."""
+        if not sys.platform.startswith('linux'):
+            return None
+        try:
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+        watcher = cls(fd)
+        # editors usually replace files, so whole directories are watched
+        directories = {os.path.dirname(os.path.abspath(path)) for path in paths}
+        for directory in directories:
+            if libc.inotify_add_watch(fd, os.fsencode(directory), cls.MASK) < 0:
+                watcher.complete = False
+        return watcher
+
+    def drain(self):
+        try:
+            while os.read(self.fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self):
+        os.close(self.fd)
+
+
+class ReloadableConfiguration(IConfiguration):
+    """Configuration whose file sources can be re-read while the process runs.
+
+    Reads are served from an immutable `DictConfiguration` snapshot which
+    `reload()` replaces atomically; sections and bound objects obtained from
+    an older snapshot keep their old values.
+    """
+
+    def __init__(self, sources, snapshot, parsers=None):
+        self._sources = sources
+        self._snapshot = snapshot
+        self._parsers = parsers
+        self._subscribers = ()
+        self._lock = Lock()
+
+    @property
+    def snapshot(self):
+        return self._snapshot
+
+    def get(self, key, default=_PLACEHOLDER):
+        return self._snapshot.get(key, default)
+
+    def parse_value(self, key, type=str):
+        return self._snapshot.parse_value(key, type)
+
+    def get_section(self, prefix):
+        return self._snapshot.get_section(prefix)
+
+    def bind(self, cls):
+        return self._snapshot.bind(cls)
+
+    def to_dict(self):
+        return self._snapshot.to_dict()
+
+    def __getitem__(self, key):
+        return self._snapshot[key]
+
+    def subscribe(self, callback, prefix=None):
+        """Calls `callback(changes, snapshot)` after reloads that change keys under `prefix`.
+
+        `changes` maps every changed key to an `(old, new)` pair, where a
+        missing value is None. Returns a function removing the subscription.
+        """
+        subscriber = (callback, prefix)
+        with self._lock:
+            self._subscribers += (subscriber,)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = tuple(s for s in self._subscribers if s is not subscriber)
+        return unsubscribe
+
+    def reload(self, on_error=None):
+        """Re-reads changed files and returns the changed keys as `{key: (old, new)}`.
+
+        An exception raised by a subscriber does not stop the others; it is
+        passed to `on_error`, or logged when `on_error` is None.
+        """
+        diff, snapshot, subscribers = self._swap()
+        self._notify(diff, snapshot, subscribers, on_error)
+        return diff
+
+    def _swap(self):
+        with self._lock:
+            changed = [source for source in self._sources if source.changed()]
+            if not changed:
+                return {}, None, ()
+            # read everything first, so that a broken file leaves all sources untouched
+            loaded = [source.read() for source in changed]
+            keys = set()
+            for source, (stamp, data) in zip(changed, loaded):
+                keys.update(source.data)
+                keys.update(data)
+                source.stamp, source.data = stamp, data
+            mapping = {}
+            for source in self._sources:
+                source.apply(mapping)
+            previous = self._snapshot
+            diff = {}
+            for key in keys:
+                old, new = previous._mapping.get(key), mapping.get(key)
+                if old != new:
+                    diff[key] = (old, new)
+            if not diff:
+                return diff, None, ()
+            index = previous._index
+            if index is not None:
+                index = _update_index(index, mapping, diff)
+            snapshot = self._snapshot = DictConfiguration(mapping, index, parsers=self._parsers)
+            return diff, snapshot, self._subscribers
+
+    @staticmethod
+    def _notify(diff, snapshot, subscribers, on_error):
+        for callback, prefix in subscribers:
+            if prefix is None:
+                changes = diff
+            else:
+                nested = prefix + _NESTING_SEPARATOR
+                changes = {
+                    key: change for key, change in diff.items()
+                    if key == prefix or key.startswith(nested)
+                }
+            if not changes:
+                continue
+            try:
+                callback(changes, snapshot)
+            except Exception as exc:
+                if on_error is None:
+                    logger.exception('Configuration subscriber %r failed', callback)
+                else:
+                    on_error(exc)
+
+    async def watch(self, interval=1.0, on_error=None):
+        """Reloads on file changes until cancelled.
+
+        Uses inotify where available and falls back to checking file stamps
+        every `interval` seconds. Files are read in the loop's default
+        executor, subscribers are called on the loop. Errors raised while
+        reloading (e.g. a file caught mid-write) or by subscribers are passed
+        to `on_error`, or logged without it, and the reload is retried on the
+        next change.
+        """
+        paths = [
+            source.path for source in self._sources
+            if isinstance(source, _FileSource) and isinstance(source.path, (str, bytes))
+        ]
+        watcher = _Inotify.create(paths) if paths else None
+        loop = asyncio.get_event_loop()
+        if watcher is None:
+            while True:
+                await asyncio.sleep(interval)
+                await self._reload(loop, on_error)
+
+        event = asyncio.Event()
+        loop.add_reader(watcher.fd, event.set)
+        timeout = None if watcher.complete else interval
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+                watcher.drain()
+                await self._reload(loop, on_error)
+        finally:
+            loop.remove_reader(watcher.fd)
+            watcher.close()
+
+    async def _reload(self, loop, on_error):
+        try:
+            diff, snapshot, subscribers = await loop.run_in_executor(None, self._swap)
+        except Exception as exc:
+            if on_error is None:
+                logger.exception('Reloading configuration failed')
+            else:
+                on_error(exc)
+            return
+        self._notify(diff, snapshot, subscribers, on_error)
@@ -0,0 +1,190 @@
+import asyncio
+import time
+from contextlib import contextmanager
+from threading import Lock, local
+from weakref import WeakKeyDictionary
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+_current_task = getattr(asyncio, 'current_task', None) or asyncio.Task.current_task
+
+
+class _TaskLocal:
+    """Fallback for `ContextVar` on Python < 3.7.
+
+    Values are kept per asyncio task, or per thread outside of tasks. Unlike
+    a context variable they are not inherited by tasks started meanwhile,
+    so parallel resolutions are missing from traces.
+    """
+
+    def __init__(self, name, default=None):
+        self._default = default
+        self._tasks = WeakKeyDictionary()
+        self._local = local()
+
+    def _task(self):
+        loop = asyncio.events._get_running_loop()
+        return None if loop is None else _current_task(loop)
+
+    def get(self):
+        task = self._task()
+        if task is None:
+            return getattr(self._local, 'value', self._default)
+        return self._tasks.get(task, self._default)
+
+    def set(self, value):
+        token = self.get()
+        task = self._task()
+        if task is None:
+            self._local.value = value
+        else:
+            self._tasks[task] = value
+        return token
+
+    def reset(self, token):
+        self.set(token)
+
+
+_current_node = (ContextVar or _TaskLocal)('pyautofac_trace_node', default=None)
+
+def _name(interface):
+    return getattr(interface, '__qualname__', str(interface))
+
+
+class TraceNode:
+    __slots__ = ('interface', 'cached', 'duration', 'initialize', 'children')
+
+    def __init__(self, interface, cached=False):
+        self.interface = interface
+        self.cached = cached
+        self.duration = 0.0
+        self.initialize = 0.0
+        self.children = []
+
+    def to_dict(self):
+        return {
+            'interface': _name(self.interface),
+            'cached': self.cached,
+            'duration': self.duration,
+            'initialize': self.initialize,
+            'children': [child.to_dict() for child in self.children],
+        }
+
+    def format(self, indent=0):
+        lines = []
+        if self.interface is not None:
+            if self.cached:
+                line = '%s (cached)' % _name(self.interface)
+            else:
+                line = '%s %.3fms' % (_name(self.interface), self.duration * 1000)
+                if self.initialize:
+                    line += ' (initialize %.3fms)' % (self.initialize * 1000)
+            lines.append('  ' * indent + line)
+            indent += 1
+        for child in self.children:
+            lines.append(child.format(indent))
+        return '\n'.join(lines)
+
+
+class ServiceStats:
+    __slots__ = (
+        'resolves', 'hits', 'misses', 'construction_time', 'initialize_time',
+        'dispose_time', 'wait_time',
+    )
+
+    def __init__(self):
+        self.resolves = 0
+        self.hits = 0
+        self.misses = 0
+        self.construction_time = 0.0
+        self.initialize_time = 0.0
+        self.dispose_time = 0.0
+        self.wait_time = 0.0
+
+    def to_dict(self):
+        return {
+            'resolves': self.resolves,
+            'hits': self.hits,
+            'misses': self.misses,
+            'construction_time': self.construction_time,
+            'initialize_time': self.initialize_time,
+            'dispose_time': self.dispose_time,
+            'wait_time': self.wait_time,
+        }
+
+
+class ContainerStats:
+    def __init__(self):
+        self.services = {}
+        self._lock = Lock()
+
+    def __getitem__(self, cls):
+        return self.services[cls]
+
+    def _get(self, cls):
+        stats = self.services.get(cls)
+        if stats is None:
+            stats = self.services[cls] = ServiceStats()
+        return stats
+
+    def on_hit(self, cls):
+        with self._lock:
+            stats = self._get(cls)
+            stats.resolves += 1
+            stats.hits += 1
+        node = _current_node.get()
+        if node is not None:
+            node.children.append(TraceNode(cls, cached=True))
+
+    def on_construct(self, cls, seconds):
+        with self._lock:
+            stats = self._get(cls)
+            stats.resolves += 1
+            stats.misses += 1
+            stats.construction_time += seconds
+
+    def on_initialize(self, cls, seconds):
+        with self._lock:
+            self._get(cls).initialize_time += seconds
+        node = _current_node.get()
+        if node is not None and node.interface is cls:
+            node.initialize = seconds
+
+    def on_dispose(self, cls, seconds):
+        with self._lock:
+            self._get(cls).dispose_time += seconds
+
+    def on_wait(self, cls, seconds):
+        with self._lock:
+            self._get(cls).wait_time += seconds
+
+    def enter(self, cls):
+        parent = _current_node.get()
+        node = token = None
+        if parent is not None:
+            node = TraceNode(cls)
+            parent.children.append(node)
+            token = _current_node.set(node)
+        return cls, time.perf_counter(), node, token
+
+    def exit(self, frame):
+        cls, start, node, token = frame
+        elapsed = time.perf_counter() - start
+        if node is not None:
+            node.duration = elapsed
+            _current_node.reset(token)
+        self.on_construct(cls, elapsed)
+
+    @contextmanager
+    def trace(self):
+        root = TraceNode(None)
+        token = _current_node.set(root)
+        try:
+            yield root
+        finally:
+            _current_node.reset(token)
+
+    def to_dict(self):
+        with self._lock:
+            return {_name(cls): stats.to_dict() for cls, stats in self.services.items()}
@@ -0,0 +1,20 @@
+import pytest
+
+from pyautofac import ContainerBuilder
+
+
+def pytest_addoption(parser):
+    parser.addoption('--compiled', action='store_true',
+                     help='run the suite with ContainerBuilder.build(compiled=True)')
+
+
+@pytest.fixture(autouse=True)
+def compiled_mode(request, monkeypatch):
+    if request.config.getoption('--compiled'):
+        build = ContainerBuilder.build
+
+        def compiled_build(self, *args, **kwargs):
+            kwargs.setdefault('compiled', True)
+            return build(self, *args, **kwargs)
+
+        monkeypatch.setattr(ContainerBuilder, 'build', compiled_build)
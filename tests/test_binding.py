@@ -0,0 +1,127 @@
+import json
+from datetime import timedelta
+
+import pytest
+
+from pyautofac import ConfigurationBuilder, ContainerBuilder
+
+
+class PoolSettings:
+    size: int
+    timeout: timedelta = timedelta(seconds=5)
+
+
+class DbSettings:
+    host: str
+    port: int = 5432
+    debug: bool = False
+    options: json
+    pool: PoolSettings
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+class Geo:
+    origin: Point
+
+
+class Repository:
+    def __init__(self, settings: DbSettings):
+        self.settings = settings
+
+
+def build_config():
+    return ConfigurationBuilder()  \
+        .add_dict({'db': {
+            'host': 'localhost',
+            'debug': 'yes',
+            'options': '{"ssl": true}',
+            'pool': {'size': 4},
+        }}) \
+        .build()
+
+
+def test_bind():
+    settings = build_config().get_section('db').bind(DbSettings)
+    assert isinstance(settings, DbSettings)
+    assert settings.host == 'localhost'
+    assert settings.port == 5432
+    assert settings.debug is True
+    assert settings.options == {'ssl': True}
+    assert settings.pool.size == 4
+    assert settings.pool.timeout == timedelta(seconds=5)
+    assert not hasattr(settings, '__dict__') or not settings.__dict__
+    assert 'host=' in repr(settings)
+
+
+def test_bind_frozen_and_cached():
+    config = build_config()
+    settings = config.get_section('db').bind(DbSettings)
+    assert config.get_section('db').bind(DbSettings) is settings
+    with pytest.raises(AttributeError):
+        settings.port = 1
+    with pytest.raises(AttributeError):
+        del settings.host
+
+
+def test_bind_missing_key():
+    config = ConfigurationBuilder().add_dict({'port': 1}).build()
+    with pytest.raises(KeyError) as error:
+        config.bind(DbSettings)
+    assert 'host' in str(error.value)
+
+
+def test_bind_custom_parser():
+    config = ConfigurationBuilder()  \
+        .add_dict({'origin': '1,2'}) \
+        .add_parser(Point, lambda value: Point(*map(int, value.split(',')))) \
+        .build()
+    assert config.bind(Geo).origin.y == 2
+
+
+class Area:
+    origin: Point = Point(0, 0)
+    zoom: int = 1
+
+
+class Map:
+    name: str
+    area: Area
+
+
+def test_bind_missing_section_keeps_parsers():
+    config = ConfigurationBuilder()  \
+        .add_dict({'name': 'world'}) \
+        .add_parser(Point, lambda value: Point(*map(int, value.split(',')))) \
+        .build()
+    bound = config.bind(Map)
+    assert bound.area.origin is Area.origin
+    assert bound.area.zoom == 1
+    assert config.get_section('area') is config.get_section('area')
+    assert config.get_section('area') is not ConfigurationBuilder().build().get_section('area')
+
+
+@pytest.mark.asyncio
+async def test_register_settings():
+    config = build_config().get_section('db')
+    builder = ContainerBuilder()
+    builder.register_settings(DbSettings, config)
+    builder.register_class(Repository)
+    container = builder.build()
+    repository = await container.resolve(Repository)
+    assert repository.settings is config.bind(DbSettings)
+
+
+class SlottedSettings:
+    __slots__ = ()
+    name: str
+
+
+def test_bind_slotted():
+    settings = ConfigurationBuilder().add_dict({'name': 'x'}).build().bind(SlottedSettings)
+    assert settings.name == 'x'
+    assert not hasattr(settings, '__dict__')
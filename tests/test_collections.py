@@ -0,0 +1,117 @@
+from typing import List
+
+import pytest
+
+from pyautofac import ContainerBuilder
+from pyautofac.exceptions import AlreadyRegistered
+
+
+class IHandler:
+    pass
+
+
+class FirstHandler(IHandler):
+    pass
+
+
+class SecondHandler(IHandler):
+    pass
+
+
+class ThirdHandler(IHandler):
+    pass
+
+
+class Pipeline:
+    def __init__(self, handlers: List[IHandler]):
+        self.handlers = handlers
+
+
+class IValidator:
+    pass
+
+
+class Form:
+    def __init__(self, validators: List[IValidator]):
+        self.validators = validators
+
+
+def build_pipeline(*lifetimes, compiled=False):
+    builder = ContainerBuilder()
+    handlers = (FirstHandler, SecondHandler, ThirdHandler)
+    for cls, lifetime in zip(handlers, lifetimes):
+        proxy = builder.register_class(cls).as_interface(IHandler).allow_multiple()
+        getattr(proxy, lifetime)()
+    builder.register_class(Pipeline)
+    return builder.build(compiled=compiled)
+
+
+def test_duplicate_requires_allow_multiple():
+    builder = ContainerBuilder()
+    builder.register_class(FirstHandler).as_interface(IHandler)
+    builder.register_class(SecondHandler).as_interface(IHandler)
+    with pytest.raises(AlreadyRegistered):
+        builder.build()
+
+
+@pytest.mark.asyncio
+async def test_inject_all_in_order():
+    container = build_pipeline('always_new', 'always_new', 'always_new')
+    pipeline = await container.resolve(Pipeline)
+    assert [type(h) for h in pipeline.handlers] == [FirstHandler, SecondHandler, ThirdHandler]
+    assert isinstance(await container.resolve(IHandler), ThirdHandler)
+    handlers = await container.resolve(List[IHandler])
+    assert [type(h) for h in handlers] == [FirstHandler, SecondHandler, ThirdHandler]
+
+
+@pytest.mark.asyncio
+async def test_collection_lifetime():
+    container = build_pipeline('single_instance', 'single_instance', 'single_instance')
+    nested = container.create_nested()
+    assert await nested.resolve(List[IHandler]) is await container.resolve(List[IHandler])
+
+    container = build_pipeline('single_instance', 'per_lifetime', 'single_instance')
+    nested = container.create_nested()
+    first = await nested.resolve(List[IHandler])
+    assert await nested.resolve(List[IHandler]) is first
+    other = await container.create_nested().resolve(List[IHandler])
+    assert other is not first
+    assert other[0] is first[0]
+    assert other[1] is not first[1]
+
+    container = build_pipeline('single_instance', 'always_new', 'single_instance')
+    first = await container.resolve(List[IHandler])
+    assert await container.resolve(List[IHandler]) is not first
+
+
+@pytest.mark.asyncio
+async def test_member_shared_with_single_resolve():
+    container = build_pipeline('per_lifetime', 'per_lifetime', 'per_lifetime')
+    pipeline = await container.resolve(Pipeline)
+    assert pipeline.handlers[-1] is await container.resolve(IHandler)
+
+
+@pytest.mark.asyncio
+async def test_unregistered_collection_is_empty():
+    builder = ContainerBuilder()
+    builder.register_class(Form)
+    container = builder.build(validate=True)
+    form = await container.resolve(Form)
+    assert form.validators == []
+
+
+@pytest.mark.asyncio
+async def test_resolve_single_member_collection():
+    builder = ContainerBuilder()
+    builder.register_class(FirstHandler).as_interface(IHandler).allow_multiple()
+    container = builder.build()
+    handlers = await container.resolve(List[IHandler])
+    assert [type(handler) for handler in handlers] == [FirstHandler]
+    assert container.resolve_sync(List[IHandler])[0] is not handlers[0]
+
+
+def test_collection_sync_and_compiled():
+    container = build_pipeline('always_new', 'single_instance', 'always_new', compiled=True)
+    pipeline = container.resolve_sync(Pipeline)
+    assert [type(h) for h in pipeline.handlers] == [FirstHandler, SecondHandler, ThirdHandler]
+    assert container.resolve_sync(Pipeline).handlers[1] is pipeline.handlers[1]
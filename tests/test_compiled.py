@@ -0,0 +1,101 @@
+import pytest
+
+from pyautofac import ContainerBuilder, Factory, IAsyncResource, SyncFactory
+from pyautofac.codegen import _INLINE_BUDGET
+
+
+class Config:
+    pass
+
+
+class Clock:
+    pass
+
+
+class Leaf:
+    def __init__(self, config: Config):
+        self.config = config
+
+
+class Middle:
+    def __init__(self, leaf: Leaf, clock: Clock):
+        self.leaf = leaf
+        self.clock = clock
+
+
+class Top:
+    def __init__(self, middle: Middle, leaves: SyncFactory[Leaf], async_leaves: Factory[Leaf]):
+        self.middle = middle
+        self.leaves = leaves
+        self.async_leaves = async_leaves
+
+
+class Resource(IAsyncResource):
+    async def initialize(self):
+        pass
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class UsesResource:
+    def __init__(self, resource: Resource):
+        self.resource = resource
+
+
+def build():
+    config = Config()
+    builder = ContainerBuilder()
+    builder.register_instance(config)
+    builder.register_class(Clock).single_instance()
+    builder.register_class(Leaf)
+    builder.register_class(Middle)
+    builder.register_class(Top)
+    builder.register_class(Resource)
+    builder.register_class(UsesResource)
+    return config, builder.build(compiled=True)
+
+
+def test_generated_source():
+    config, container = build()
+    source = container._mapping[Top].compiled.source
+    assert source.count('(') - source.count('()') >= 5
+    assert 'resolve(' in source
+    assert container._mapping[Resource].compiled is None
+    assert container._mapping[UsesResource].compiled is None
+
+
+@pytest.mark.asyncio
+async def test_compiled_resolve():
+    config, container = build()
+    top = container.resolve_sync(Top)
+    assert top.middle.leaf.config is config
+    assert top.middle.clock is container.resolve_sync(Clock)
+    assert isinstance(top.leaves(), Leaf)
+    assert isinstance(await top.async_leaves(), Leaf)
+    top2 = await container.resolve(Top)
+    assert top2 is not top
+    assert top2.middle.clock is top.middle.clock
+    nested = container.create_nested()
+    assert nested.resolve_sync(Top).middle.clock is top.middle.clock
+    assert isinstance((await container.resolve(UsesResource)).resource, Resource)
+
+
+def test_inline_budget():
+    classes = [Config]
+    for i in range(_INLINE_BUDGET + 10):
+        def __init__(self, dep):
+            self.dep = dep
+        __init__.__annotations__ = {'dep': classes[-1]}
+        classes.append(type('Chain%d' % i, (), {'__init__': __init__}))
+    builder = ContainerBuilder()
+    for cls in classes:
+        builder.register_class(cls)
+    container = builder.build(compiled=True)
+    top = container.resolve_sync(classes[-1])
+    depth = 0
+    while hasattr(top, 'dep'):
+        top = top.dep
+        depth += 1
+    assert depth == len(classes) - 1
+    assert '_c' in container._mapping[classes[-1]].compiled.source
@@ -2,6 +2,9 @@ import os
 import json
 from contextlib import contextmanager
 from datetime import timedelta
+from decimal import Decimal
+
+import pytest
 
 from pyautofac import ConfigurationBuilder, IConfiguration
 
@@ -107,3 +110,163 @@ def test_command_line():
         .build()
     assert config['test'] == '11'
     assert config['foo'] == 'bar'
+
+
+def test_configuration_get_section_cached_read_only():
+    config = ConfigurationBuilder()  \
+        .add_dict({'foo': {'bar': {'zoo': 1}}, 'foobar': 2}) \
+        .build()
+    section = config.get_section('foo')
+    assert config.get_section('foo') is section
+    assert section.get_section('bar') is config.get_section('foo:bar')
+    assert section.to_dict() == {'bar': {'zoo': '1'}}
+    with pytest.raises(TypeError):
+        section['bar']['zoo'] = '2'
+    section.to_dict()['bar']['zoo'] = '2'
+    assert config.get_section('foo:bar')['zoo'] == '1'
+    assert config.get_section('foobar').to_dict() == {}
+    assert config.get_section('foo:bar:zoo').to_dict() == {}
+
+
+def test_configuration_get_section_value_and_section():
+    config = ConfigurationBuilder()  \
+        .add_command_line(['--a=1', '--a:b=2']) \
+        .build()
+    assert config['a'] == '1'
+    assert config.get_section('a').to_dict() == {'b': '2'}
+
+
+def test_builders_do_not_share_keys():
+    first = ConfigurationBuilder().add_dict({'first': 1}).build()
+    second = ConfigurationBuilder().add_dict({'second': 2}).build()
+    assert first.to_dict() == {'first': '1'}
+    assert second.to_dict() == {'second': '2'}
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def test_parse_value_cached():
+    calls = []
+
+    def parse_price(value):
+        calls.append(value)
+        return Decimal(value)
+
+    config = ConfigurationBuilder()  \
+        .add_dict({'price': '1.5', 'section': {'price': '2.5'}, 'timeout': '1:30'}) \
+        .add_parser(Decimal, parse_price) \
+        .build()
+    price = config.parse_value('price', Decimal)
+    assert price == Decimal('1.5')
+    assert config.parse_value('price', Decimal) is price
+    assert config.get_section('section').parse_value('price', Decimal) == Decimal('2.5')
+    assert calls == ['1.5', '2.5']
+    assert config.parse_value('timeout', timedelta) is config.parse_value('timeout', timedelta)
+
+
+def test_parse_value_mutable_not_cached():
+    calls = []
+
+    def parse_point(value):
+        calls.append(value)
+        return Point(*map(int, value.split(',')))
+
+    config = ConfigurationBuilder()  \
+        .add_dict({'json': '{"a": [1]}', 'origin': '1,2'}) \
+        .add_parser(Point, parse_point) \
+        .build()
+    config.parse_value('json', json)['a'].append(2)
+    assert config.parse_value('json', json) == {'a': [1]}
+    assert config.parse_value('json', str) == '{"a": [1]}'
+    config.parse_value('origin', Point).x = 10
+    assert config.parse_value('origin', Point).x == 1
+    assert calls == ['1,2', '1,2']
+
+
+def test_parse_value_cache_opt_in():
+    calls = []
+
+    def parse_point(value):
+        calls.append(value)
+        return Point(*map(int, value.split(',')))
+
+    config = ConfigurationBuilder()  \
+        .add_dict({'json': '{"a": [1]}', 'origin': '1,2', 'section': {'origin': '3,4'}}) \
+        .add_parser(Point, parse_point, cache=True) \
+        .add_parser(json, cache=True) \
+        .build()
+    assert config.parse_value('json', json) is config.parse_value('json', json)
+    assert config.parse_value('json', json) == {'a': [1]}
+    point = config.parse_value('origin', Point)
+    assert config.parse_value('origin', Point) is point
+    assert config.get_section('section').parse_value('origin', Point).x == 3
+    assert calls == ['1,2', '3,4']
+
+
+def test_parse_value_errors_not_cached():
+    config = ConfigurationBuilder()  \
+        .add_dict({'number': 'abc'}) \
+        .build()
+    for _ in range(2):
+        with pytest.raises(ValueError):
+            config.parse_value('number', int)
+        with pytest.raises(KeyError):
+            config.parse_value('missing', int)
+    with pytest.raises(TypeError):
+        config.parse_value('number', Point)
+    with pytest.raises(TypeError):
+        ConfigurationBuilder().add_parser(Point, None)
+    with pytest.raises(TypeError):
+        ConfigurationBuilder().add_parser(Point, 'not callable')
+
+
+NESTED = {
+    'flags': {'a': True, 'b': None, 'c': {'d': 1.5, 'e': 'x "y"'}, 'empty': {}},
+    'list': [1, {'x': 2}],
+    'number': -12,
+}
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 1 << 16])
+def test_json_file_streaming(tmp_path, monkeypatch, chunk_size):
+    from pyautofac import loaders
+    monkeypatch.setattr(loaders, '_CHUNK_SIZE', chunk_size)
+    path = str(tmp_path / 'config.json')
+    with open(path, 'w') as fo:
+        json.dump(NESTED, fo, indent=2)
+    expected = ConfigurationBuilder().add_json_file(path).build()
+    config = ConfigurationBuilder().add_json_file(path, streaming=True).build()
+    assert config.to_dict() == expected.to_dict()
+    assert config['flags:c:e'] == 'x "y"'
+    assert config['list'] == "[1, {'x': 2}]"
+
+
+def test_json_file_streaming_errors(tmp_path):
+    path = tmp_path / 'config.json'
+    for content, error in [('[1]', TypeError), ('{"a": 1,}', ValueError), ('{"a": {"b": 1}', ValueError)]:
+        path.write_text(content)
+        with pytest.raises(error):
+            ConfigurationBuilder().add_json_file(str(path), streaming=True)
+
+
+def test_yaml_file_streaming(tmp_path):
+    yaml = pytest.importorskip('yaml')
+    path = tmp_path / 'config.yaml'
+    path.write_text(
+        'defaults: &defaults\n'
+        '  host: localhost\n'
+        '  port: 5432\n'
+        'database:\n'
+        '  host: db\n'
+        '  <<: *defaults\n'
+        'switches: {a: yes, b: ~}\n'
+        'ports: [1, 2]\n'
+        + yaml.dump(NESTED))
+    expected = ConfigurationBuilder().add_yaml_file(str(path)).build()
+    config = ConfigurationBuilder().add_yaml_file(str(path), streaming=True).build()
+    assert config.to_dict() == expected.to_dict()
+    assert config.get_section('database').to_dict() == {'host': 'db', 'port': '5432'}
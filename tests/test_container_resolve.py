@@ -1,3 +1,5 @@
+import traceback
+
 import pytest
 
 from pyautofac import ContainerBuilder
@@ -57,8 +59,14 @@ async def test_broken_constructor():
     builder = ContainerBuilder()
     builder.register_class(BrokenConstructor)
     container = builder.build()
-    with pytest.raises(NotAnnotatedConstructorParam):
-        await container.resolve(BrokenConstructor)
+    errors = []
+    for _ in range(3):
+        with pytest.raises(NotAnnotatedConstructorParam) as info:
+            await container.resolve(BrokenConstructor)
+        errors.append(info.value)
+    # every resolve raises a fresh exception, tracebacks do not pile up
+    assert len({id(error) for error in errors}) == 3
+    assert len({len(traceback.extract_tb(error.__traceback__)) for error in errors}) == 1
 
 
 @pytest.mark.asyncio
@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource
+from pyautofac.exceptions import DisposeError
+
+
+class Log:
+    def __init__(self):
+        self.messages = []
+        self.running = 0
+        self.max_running = 0
+
+
+class Resource(IAsyncResource):
+    delay = 0.01
+    fail = False
+
+    def __init__(self, log: Log):
+        self.log = log
+
+    async def initialize(self):
+        pass
+
+    async def dispose(self, exc=None):
+        name = type(self).__name__
+        self.log.running += 1
+        self.log.max_running = max(self.log.max_running, self.log.running)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise RuntimeError(name)
+            self.log.messages.append(name)
+        finally:
+            self.log.running -= 1
+
+
+class Pool(Resource):
+    pass
+
+
+class Http(Resource):
+    pass
+
+
+class Repository(Resource):
+    def __init__(self, log: Log, pool: Pool):
+        super().__init__(log)
+
+
+class Handler(Resource):
+    def __init__(self, log: Log, repository: Repository, http: Http):
+        super().__init__(log)
+
+
+class Broken(Resource):
+    fail = True
+
+
+class Hanging(Resource):
+    delay = 10
+
+
+class App:
+    def __init__(self, handler: Handler, broken: Broken, hanging: Hanging):
+        pass
+
+
+def build():
+    log = Log()
+    builder = ContainerBuilder()
+    builder.register_instance(log)
+    for cls in (Pool, Http, Repository, Handler, Broken):
+        builder.register_class(cls).per_lifetime()
+    builder.register_class(Hanging).per_lifetime().with_dispose_timeout(0.01)
+    builder.register_class(App)
+    return log, builder.build()
+
+
+@pytest.mark.asyncio
+async def test_dispose_levels():
+    log, container = build()
+    await container.resolve(Handler)
+    await container.dispose()
+    assert log.messages[0] == 'Handler'
+    assert log.messages.index('Repository') < log.messages.index('Pool')
+    assert set(log.messages) == {'Handler', 'Repository', 'Http', 'Pool'}
+    assert log.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_dispose_aggregates_errors():
+    log, container = build()
+    await container.resolve(App)
+    with pytest.raises(DisposeError) as info:
+        await container.dispose()
+    errors = info.value.errors
+    assert len(errors) == 2
+    assert any(isinstance(e, RuntimeError) for e in errors)
+    assert any(isinstance(e, asyncio.TimeoutError) for e in errors)
+    assert set(log.messages) == {'Handler', 'Repository', 'Http', 'Pool'}
+
+
+@pytest.mark.asyncio
+async def test_dispose_timeout():
+    log, container = build()
+    await container.resolve(Handler)
+    await container.resolve(Http)
+    Http.delay = 1
+    try:
+        with pytest.raises(DisposeError):
+            await container.dispose(timeout=0.05)
+    finally:
+        Http.delay = 0.01
+    assert 'Http' not in log.messages
+    assert 'Pool' in log.messages
@@ -0,0 +1,180 @@
+import asyncio
+import gc
+import json
+import os
+import signal
+import threading
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource, Lazy
+from pyautofac import container as container_module
+
+
+class Log:
+    def __init__(self):
+        self.messages = []
+
+
+class Config:
+    def __init__(self, log: Log):
+        log.messages.append('config')
+
+
+class Socket(IAsyncResource):
+    def __init__(self, log: Log):
+        self.log = log
+        self.pid = None
+
+    async def initialize(self):
+        self.pid = os.getpid()
+        self.log.messages.append('socket')
+
+    async def dispose(self, exc=None):
+        self.log.messages.append('socket-dispose')
+
+
+class Client:
+    def __init__(self, socket: Socket, config: Config):
+        self.socket = socket
+        self.config = config
+
+
+class Cache:
+    def __init__(self, log: Log):
+        self.log = log
+        self.pid = os.getpid()
+
+
+def reconnect(cache):
+    cache.pid = os.getpid()
+    cache.log.messages.append('cache-hook')
+
+
+def build():
+    builder = ContainerBuilder()
+    builder.register_instance(Log())
+    builder.register_class(Config).single_instance()
+    builder.register_class(Socket).single_instance().fork_unsafe()
+    builder.register_class(Client).single_instance()
+    builder.register_class(Cache).single_instance().fork_unsafe(reconnect)
+    return builder.build()
+
+
+@pytest.mark.asyncio
+async def test_after_fork_in_process():
+    container = build()
+    await container.warm_up()
+    log = await container.resolve(Log)
+    config = await container.resolve(Config)
+    client = await container.resolve(Client)
+    cache = await container.resolve(Cache)
+    log.messages.clear()
+    reinitialized = await container.after_fork()
+    assert set(reinitialized) == {Socket, Cache, Client}
+    assert await container.resolve(Config) is config
+    assert await container.resolve(Cache) is cache
+    new_client = await container.resolve(Client)
+    assert new_client is not client
+    assert new_client.config is config
+    assert new_client.socket is not client.socket
+    assert sorted(log.messages) == ['cache-hook', 'socket']
+    await container.dispose()
+    assert log.messages.count('socket-dispose') == 1
+
+
+class LazyHolder:
+    def __init__(self, socket: Lazy[Socket]):
+        self.socket = socket
+
+
+@pytest.mark.asyncio
+async def test_after_fork_rebuilds_lazy_holders():
+    builder = ContainerBuilder()
+    builder.register_instance(Log())
+    builder.register_class(Socket).single_instance().fork_unsafe()
+    builder.register_class(LazyHolder).single_instance()
+    container = builder.build()
+    holder = await container.resolve(LazyHolder)
+    socket = await holder.socket()
+    assert set(await container.after_fork()) == {Socket, LazyHolder}
+    new_holder = await container.resolve(LazyHolder)
+    assert new_holder is not holder
+    assert await new_holder.socket() is await container.resolve(Socket) is not socket
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires os.fork')
+@pytest.mark.asyncio
+async def test_fork():
+    container = build()
+    await container.warm_up()
+    client = await container.resolve(Client)
+    parent_pid = os.getpid()
+    container.prepare_fork()
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        try:
+            os.close(read)
+            async def child():
+                await container.after_fork()
+                new_client = await container.resolve(Client)
+                cache = await container.resolve(Cache)
+                return {
+                    'socket_pid': new_client.socket.pid,
+                    'cache_pid': cache.pid,
+                    'config_shared': new_client.config is client.config,
+                }
+            result = asyncio.new_event_loop().run_until_complete(child())
+            os.write(write, json.dumps(result).encode())
+        finally:
+            os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as fo:
+        result = json.loads(fo.read())
+    os.waitpid(pid, 0)
+    gc.unfreeze()
+    assert result['socket_pid'] == pid
+    assert result['cache_pid'] == pid
+    assert result['config_shared']
+    assert client.socket.pid == parent_pid
+
+
+@pytest.mark.skipif(not hasattr(os, 'register_at_fork'), reason='requires os.register_at_fork')
+@pytest.mark.asyncio
+async def test_fork_with_held_lock():
+    container = build()
+    await container.warm_up()
+    read, write = os.pipe()
+    # another thread of the parent holds the lock guarding scope lock creation
+    acquired, release = threading.Event(), threading.Event()
+
+    def hold():
+        with container_module._LOCK_INIT:
+            acquired.set()
+            release.wait()
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    acquired.wait()
+    pid = os.fork()
+    if pid:
+        release.set()
+        thread.join()
+    if pid == 0:
+        try:
+            os.close(read)
+            signal.alarm(5)
+
+            async def child():
+                await container.after_fork()
+                async with container.create_nested() as nested:
+                    await nested.resolve(Client)
+            asyncio.new_event_loop().run_until_complete(child())
+            os.write(write, b'ok')
+        finally:
+            os._exit(0)
+    os.close(write)
+    with os.fdopen(read) as fo:
+        result = fo.read()
+    os.waitpid(pid, 0)
+    assert result == 'ok'
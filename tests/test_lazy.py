@@ -0,0 +1,71 @@
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource, Lazy
+
+
+class Log:
+    def __init__(self):
+        self.messages = []
+
+
+class Mailer(IAsyncResource):
+    def __init__(self, log: Log):
+        self.log = log
+
+    async def initialize(self):
+        self.log.messages.append('mailer-init')
+
+    async def dispose(self, exc=None):
+        self.log.messages.append('mailer-dispose')
+
+
+class Report:
+    def __init__(self, log: Log):
+        log.messages.append('report')
+
+
+class Handler:
+    def __init__(self, mailer: Lazy[Mailer], report: Lazy[Report]):
+        self.mailer = mailer
+        self.report = report
+
+
+def build(**kwargs):
+    builder = ContainerBuilder()
+    builder.register_instance(Log())
+    builder.register_class(Mailer).per_lifetime()
+    builder.register_class(Report)
+    builder.register_class(Handler)
+    return builder.build(**kwargs)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('compiled', [False, True])
+async def test_lazy(compiled):
+    container = build(compiled=compiled)
+    log = await container.resolve(Log)
+    async with container.create_nested() as nested:
+        handler = await nested.resolve(Handler)
+        assert log.messages == []
+        assert not handler.mailer.is_resolved
+        mailer = await handler.mailer()
+        assert await handler.mailer() is mailer
+        assert handler.mailer.is_resolved
+        assert await nested.resolve(Mailer) is mailer
+        assert log.messages == ['mailer-init']
+        report = await handler.report()
+        assert await handler.report() is report
+        assert log.messages == ['mailer-init', 'report']
+    assert log.messages[-1] == 'mailer-dispose'
+
+
+@pytest.mark.asyncio
+async def test_lazy_from_sync_resolve():
+    container = build()
+    handler = container.resolve_sync(Handler)
+    assert isinstance(await handler.mailer(), Mailer)
+
+
+def test_lazy_marker_is_cached():
+    assert Lazy[Mailer] is Lazy[Mailer]
+    assert Lazy[Mailer] is not Lazy[Report]
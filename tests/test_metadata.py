@@ -0,0 +1,152 @@
+import json
+import subprocess
+import sys
+from typing import List
+
+import pytest
+
+from pyautofac import ContainerBuilder, Factory
+from pyautofac import plan as plan_module
+
+
+class Database:
+    pass
+
+
+class IPlugin:
+    pass
+
+
+class Plugin(IPlugin):
+    pass
+
+
+class Repository:
+    def __init__(self, db: Database, plugins: List[IPlugin], factory: Factory[Database]):
+        self.db = db
+        self.plugins = plugins
+        self.factory = factory
+
+
+def build(path):
+    builder = ContainerBuilder()
+    builder.register_class(Database).single_instance()
+    builder.register_class(Plugin).as_interface(IPlugin)
+    builder.register_class(Repository)
+    return builder.build(metadata_cache=path)
+
+
+def not_called(cls):
+    raise AssertionError('constructor of %s inspected' % cls)
+
+
+@pytest.mark.asyncio
+async def test_metadata_reused(tmp_path, monkeypatch):
+    path = str(tmp_path / 'metadata.json')
+    build(path)
+    with open(path) as fo:
+        classes = json.load(fo)['classes']
+    assert len(classes) == 3
+
+    monkeypatch.setattr(plan_module, 'get_constructor_params', not_called)
+    container = build(path)
+    repository = await container.resolve(Repository)
+    assert repository.db is await container.resolve(Database)
+    assert [type(p) for p in repository.plugins] == [Plugin]
+    assert await repository.factory() is repository.db
+
+
+def test_stale_metadata_ignored(tmp_path, monkeypatch):
+    path = str(tmp_path / 'metadata.json')
+    build(path)
+    with open(path) as fo:
+        data = json.load(fo)
+    for entry in data['classes'].values():
+        entry['stamp'] = [0, 0]
+        entry['dependencies'] = []
+    with open(path, 'w') as fo:
+        json.dump(data, fo)
+    container = build(path)
+    assert container.resolve_sync(Repository).plugins
+    monkeypatch.setattr(plan_module, 'get_constructor_params', not_called)
+    build(path)
+
+
+def test_corrupt_metadata_ignored(tmp_path):
+    path = tmp_path / 'metadata.json'
+    path.write_text('{not json')
+    container = build(str(path))
+    assert isinstance(container.resolve_sync(Repository).db, Database)
+
+
+def test_unwritable_metadata_ignored(tmp_path):
+    container = build(str(tmp_path / 'missing' / 'metadata.json'))
+    assert isinstance(container.resolve_sync(Repository).db, Database)
+    # the temporary file is removed when it cannot replace the cache
+    path = tmp_path / 'metadata.json'
+    path.mkdir()
+    container = build(str(path))
+    assert isinstance(container.resolve_sync(Repository).db, Database)
+    assert [item.name for item in tmp_path.iterdir()] == ['metadata.json']
+
+
+def test_local_classes_not_cached(tmp_path):
+    class Local:
+        def __init__(self, db: Database):
+            self.db = db
+
+    path = str(tmp_path / 'metadata.json')
+    builder = ContainerBuilder()
+    builder.register_class(Database)
+    builder.register_class(Local)
+    container = builder.build(metadata_cache=path)
+    assert isinstance(container.resolve_sync(Local).db, Database)
+    with open(path) as fo:
+        assert list(json.load(fo)['classes']) == ['%s:Database' % __name__]
+
+
+def test_configuration_import_is_light():
+    code = (
+        'import sys\n'
+        'from pyautofac import ConfigurationBuilder\n'
+        'print("pyautofac.container" in sys.modules)\n'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'False'
+
+
+def test_inherited_constructor_module_stamped(tmp_path, monkeypatch):
+    import importlib
+    (tmp_path / 'meta_base.py').write_text(
+        'from tests.test_metadata import Database\n'
+        'class Base:\n'
+        '    def __init__(self, db: Database):\n'
+        '        self.db = db\n')
+    (tmp_path / 'meta_child.py').write_text(
+        'from meta_base import Base\n'
+        'class Child(Base):\n'
+        '    pass\n')
+    monkeypatch.syspath_prepend(str(tmp_path))
+    child = importlib.import_module('meta_child').Child
+    path = str(tmp_path / 'metadata.json')
+
+    def build_child():
+        builder = ContainerBuilder()
+        builder.register_class(Database)
+        builder.register_class(child)
+        return builder.build(metadata_cache=path)
+
+    build_child()
+    with open(path) as fo:
+        stamp = json.load(fo)['classes']['meta_child:Child']['stamp']
+    assert [module for module, _, _ in stamp] == ['meta_child', 'meta_base']
+
+    # the base module changes on disk: the cached entry must not be used
+    (tmp_path / 'meta_base.py').write_text(
+        'from tests.test_metadata import Database\n'
+        'class Base:\n'
+        '    def __init__(self, db: Database, other: Database):\n'
+        '        self.db = db\n')
+    monkeypatch.setattr(plan_module, 'get_constructor_params', not_called)
+    with pytest.raises(AssertionError):
+        build_child().resolve_sync(child)
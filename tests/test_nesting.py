@@ -1,6 +1,7 @@
 import pytest
 
-from pyautofac import ContainerBuilder
+from pyautofac import ContainerBuilder, IAsyncResource
+from pyautofac.globals import Tags
 from pyautofac.exceptions import NotSubclass, NotAnnotatedConstructorParam
 
 
@@ -72,3 +73,86 @@ async def test_nesting_no_singleton():
     s1 = await container.resolve(IFoo)
     s2 = await nested.resolve(IFoo)
     assert s1 is not s2
+
+
+class AsyncSingleton(IAsyncResource):
+    async def initialize(self):
+        pass
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class AsyncFoo(AsyncSingleton):
+    pass
+
+
+class FailingLock:
+    def __enter__(self):
+        raise AssertionError('lock taken on cache hit')
+
+    def __exit__(self, *args):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_cached_resolve_skips_lock():
+    builder = ContainerBuilder()
+    builder.register_class(AsyncSingleton).single_instance()
+    builder.register_class(AsyncFoo).per_lifetime()
+    container = builder.build()
+    nested = container.create_nested()
+    s1 = await container.resolve(AsyncSingleton)
+    f1 = await nested.resolve(AsyncFoo)
+    container._lock = nested._lock = FailingLock()
+    assert await nested.resolve(AsyncSingleton) is s1
+    assert await nested.resolve(AsyncFoo) is f1
+
+
+@pytest.mark.asyncio
+async def test_nested_is_cheap():
+    builder = ContainerBuilder()
+    builder.register_class(AsyncFoo).per_lifetime()
+    builder.register_class(AsyncSingleton).single_instance()
+    container = builder.build()
+    nested = container.create_nested()
+    assert not nested._cache
+    assert not nested._pending
+    assert not nested._to_dispose
+    await nested.resolve(AsyncSingleton)
+    assert not nested._cache
+    await nested.resolve(AsyncFoo)
+    assert list(nested._cache) == [AsyncFoo]
+    assert not nested._pending
+
+
+@pytest.mark.asyncio
+async def test_tag_method():
+    builder = ContainerBuilder()
+    builder.register_class(Foo).as_interface(IFoo).tag(Tags.SingleInstance)
+    container = builder.build()
+    nested = container.create_nested()
+    assert await nested.resolve(IFoo) is await container.resolve(IFoo)
+
+
+def test_slotted_internals():
+    builder = ContainerBuilder()
+    proxy = builder.register_class(Foo)
+    container = builder.build()
+    nested = container.create_nested()
+    for obj in (proxy, container, nested, container._mapping[Foo]):
+        assert not hasattr(obj, '__dict__')
+
+
+def test_proxy_tag_deprecated_alias():
+    builder = ContainerBuilder()
+    proxy = builder.register_class(Foo)
+    with pytest.warns(DeprecationWarning):
+        assert proxy.tag == Tags.AlwaysNew
+    assert proxy.tag(Tags.Lifetime) is proxy
+    assert proxy.lifetime is Tags.Lifetime
+    with pytest.warns(DeprecationWarning):
+        proxy.tag = Tags.SingleInstance
+    assert proxy.lifetime is Tags.SingleInstance
+    with pytest.warns(DeprecationWarning):
+        assert proxy.tag.name == 'SingleInstance'
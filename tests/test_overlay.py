@@ -0,0 +1,198 @@
+from typing import List
+
+import pytest
+
+from pyautofac import ContainerBuilder, Factory, IAsyncResource
+from pyautofac.exceptions import NotSyncResolvable
+
+
+class ISettings:
+    pass
+
+
+class DefaultSettings(ISettings):
+    pass
+
+
+class TenantSettings(ISettings):
+    pass
+
+
+class Database:
+    pass
+
+
+class Repository:
+    def __init__(self, db: Database, settings: ISettings):
+        self.db = db
+        self.settings = settings
+
+
+class Service:
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+class Notifier:
+    def __init__(self, settings: Factory[ISettings]):
+        self.settings = settings
+
+
+class IPlugin:
+    pass
+
+
+class CorePlugin(IPlugin):
+    pass
+
+
+class TenantPlugin(IPlugin):
+    pass
+
+
+class Plugins:
+    def __init__(self, plugins: List[IPlugin]):
+        self.plugins = plugins
+
+
+class Connection(IAsyncResource):
+    initialized = 0
+    disposed = 0
+
+    async def initialize(self):
+        Connection.initialized += 1
+
+    async def dispose(self, exc=None):
+        Connection.disposed += 1
+
+
+def build():
+    builder = ContainerBuilder()
+    builder.register_class(DefaultSettings).as_interface(ISettings).single_instance()
+    builder.register_class(Database).single_instance()
+    builder.register_class(Repository).single_instance()
+    builder.register_class(Service).per_lifetime()
+    builder.register_class(Notifier).single_instance()
+    builder.register_class(CorePlugin).as_interface(IPlugin)
+    builder.register_class(Plugins)
+    return builder.build()
+
+
+def override_settings(builder):
+    builder.register_class(TenantSettings).as_interface(ISettings).single_instance()
+
+
+@pytest.mark.asyncio
+async def test_override_shares_unaffected_singletons():
+    container = build()
+    child = container.create_nested(override_settings)
+    repository = await child.resolve(Repository)
+    assert isinstance(repository.settings, TenantSettings)
+    assert repository.db is await container.resolve(Database)
+    assert await child.resolve(Repository) is repository
+    root_repository = await container.resolve(Repository)
+    assert root_repository is not repository
+    assert isinstance(root_repository.settings, DefaultSettings)
+    assert isinstance((await child.resolve(Service)).repository.settings, TenantSettings)
+
+
+@pytest.mark.asyncio
+async def test_child_singletons_shared_by_its_scopes():
+    container = build()
+    child = container.create_nested(override_settings)
+    first = child.create_nested()
+    second = child.create_nested()
+    assert await first.resolve(ISettings) is await second.resolve(ISettings)
+    assert await first.resolve(ISettings) is await child.resolve(ISettings)
+    assert await first.resolve(Database) is await container.resolve(Database)
+    assert await first.resolve(Service) is not await second.resolve(Service)
+
+
+@pytest.mark.asyncio
+async def test_factory_dependents_are_overridden():
+    container = build()
+    child = container.create_nested(override_settings)
+    notifier = await child.resolve(Notifier)
+    assert isinstance(await notifier.settings(), TenantSettings)
+    notifier = await container.resolve(Notifier)
+    assert isinstance(await notifier.settings(), DefaultSettings)
+
+
+@pytest.mark.asyncio
+async def test_child_replaces_collection():
+    container = build()
+
+    def configure(builder):
+        builder.register_class(CorePlugin).as_interface(IPlugin)
+        builder.register_class(TenantPlugin).as_interface(IPlugin).allow_multiple()
+
+    child = container.create_nested(configure)
+    plugins = (await child.resolve(Plugins)).plugins
+    assert [type(p) for p in plugins] == [CorePlugin, TenantPlugin]
+    plugins = (await container.resolve(Plugins)).plugins
+    assert [type(p) for p in plugins] == [CorePlugin]
+
+
+@pytest.mark.asyncio
+async def test_child_disposes_own_singletons():
+    Connection.initialized = Connection.disposed = 0
+    container = build()
+
+    def configure(builder):
+        builder.register_class(Connection).single_instance()
+
+    async with container.create_nested(configure) as child:
+        assert await child.resolve(Connection) is await child.resolve(Connection)
+        assert Connection.initialized == 1
+    assert Connection.disposed == 1
+
+
+def test_parent_mapping_untouched():
+    container = build()
+    mapping = dict(container._mapping)
+    levels = {key: plan.level for key, plan in mapping.items()}
+    container.create_nested(override_settings)
+    assert container._mapping == mapping
+    assert {key: plan.level for key, plan in mapping.items()} == levels
+    assert container.resolve_sync(ISettings).__class__ is DefaultSettings
+
+
+class AsyncDatabase(Database, IAsyncResource):
+    async def initialize(self):
+        self.ready = True
+
+    async def dispose(self, exc=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_overlay_recomputes_sync_plans():
+    container = build()
+
+    def configure(builder):
+        builder.register_class(AsyncDatabase).as_interface(Database).single_instance()
+
+    child = container.create_nested(configure)
+    with pytest.raises(NotSyncResolvable):
+        child.resolve_sync(Repository)
+    assert (await child.resolve(Service)).repository.db.ready
+    assert type(container.resolve_sync(Repository).db) is Database
+    assert child._mapping[Repository].level == 1
+    assert container._mapping[Repository].level == 0
+
+
+def test_overlay_keeps_build_options():
+    builder = ContainerBuilder()
+    builder.register_class(DefaultSettings).as_interface(ISettings).single_instance()
+    builder.register_class(Database).single_instance()
+    builder.register_class(Repository)
+    container = builder.build(parallel=True, compiled=True)
+    root_compiled = container._mapping[Repository].compiled
+    child = container.create_nested().create_nested(override_settings)
+    plan = child._mapping[Repository]
+    assert plan is not container._mapping[Repository]
+    assert plan.parallel
+    assert plan.compiled is not None and plan.compiled is not root_compiled
+    assert isinstance(child.resolve_sync(Repository).settings, TenantSettings)
+    assert container._mapping[Repository].compiled is root_compiled
+    assert isinstance(container.resolve_sync(Repository).settings, DefaultSettings)
@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource
+from pyautofac.exceptions import CircularDependency
+
+
+class Tracker:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+        self.initialized = []
+
+    async def track(self, name):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        await asyncio.sleep(0.01)
+        self.running -= 1
+        self.initialized.append(name)
+
+
+class SlowResource(IAsyncResource):
+    def __init__(self, tracker: Tracker):
+        self.tracker = tracker
+
+    async def initialize(self):
+        await self.tracker.track(type(self).__name__)
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Shared(SlowResource):
+    pass
+
+
+class Database(SlowResource):
+    def __init__(self, tracker: Tracker, shared: Shared):
+        super().__init__(tracker)
+
+
+class Cache(SlowResource):
+    def __init__(self, tracker: Tracker, shared: Shared):
+        super().__init__(tracker)
+
+
+class Client(SlowResource):
+    pass
+
+
+class Service:
+    def __init__(self, db: Database, cache: Cache, client: Client):
+        self.db = db
+        self.cache = cache
+        self.client = client
+
+
+def build(parallel=False, per_registration=False):
+    builder = ContainerBuilder()
+    builder.register_instance(Tracker())
+    builder.register_class(Shared).single_instance()
+    builder.register_class(Database).single_instance()
+    builder.register_class(Cache).single_instance()
+    builder.register_class(Client).single_instance()
+    proxy = builder.register_class(Service)
+    if per_registration:
+        proxy.parallel_dependencies()
+    return builder.build(parallel=parallel)
+
+
+@pytest.mark.asyncio
+async def test_sequential_by_default():
+    container = build()
+    await container.resolve(Service)
+    tracker = await container.resolve(Tracker)
+    assert tracker.max_running == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('parallel,per_registration', [(True, False), (False, True)])
+async def test_parallel_dependencies(parallel, per_registration):
+    container = build(parallel, per_registration)
+    service = await container.resolve(Service)
+    tracker = await container.resolve(Tracker)
+    assert tracker.max_running > 1
+    assert tracker.initialized.count('Shared') == 1
+    assert service.db.tracker is tracker
+
+
+class A:
+    def __init__(self, b: 'B'):
+        pass
+
+
+class B:
+    def __init__(self, a: A, c: 'C'):
+        pass
+
+
+class C:
+    pass
+
+
+B.__init__.__annotations__['c'] = C
+A.__init__.__annotations__['b'] = B
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('parallel', [False, True])
+async def test_circular_dependency(parallel):
+    builder = ContainerBuilder()
+    builder.register_class(A).single_instance()
+    builder.register_class(B).single_instance()
+    builder.register_class(C)
+    container = builder.build(parallel=parallel)
+    assert not container._mapping[A].parallel
+    assert not container._mapping[B].parallel
+    with pytest.raises(CircularDependency):
+        await asyncio.wait_for(container.resolve(A), 1)
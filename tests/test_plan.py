@@ -0,0 +1,59 @@
+import inspect
+import pytest
+
+from pyautofac import ContainerBuilder, Factory
+from pyautofac.globals import DependencyKind, Tags
+from pyautofac.exceptions import NotAnnotatedConstructorParam
+
+
+class Foo:
+    pass
+
+
+class Bar:
+    def __init__(self, foo: Foo, factory: Factory[Foo]):
+        self.foo = foo
+        self.factory = factory
+
+
+class Broken:
+    def __init__(self, foo):
+        pass
+
+
+def test_plans_compiled_on_build():
+    builder = ContainerBuilder()
+    builder.register_class(Foo).single_instance()
+    builder.register_class(Bar).per_lifetime()
+    container = builder.build()
+    plan = container._mapping[Bar]
+    assert plan.registered_type is Bar
+    assert plan.tag is Tags.Lifetime
+    assert [(d.kind, d.type) for d in plan.dependencies] == [
+        (DependencyKind.Service, Foo),
+        (DependencyKind.Factory, Foo),
+    ]
+
+
+def test_broken_plan_keeps_error():
+    builder = ContainerBuilder()
+    builder.register_class(Broken)
+    container = builder.build()
+    assert isinstance(container._mapping[Broken].error, NotAnnotatedConstructorParam)
+
+
+@pytest.mark.asyncio
+async def test_resolve_does_not_reflect(monkeypatch):
+    builder = ContainerBuilder()
+    builder.register_class(Foo)
+    builder.register_class(Bar)
+    container = builder.build()
+
+    def fail(*args, **kwargs):
+        raise AssertionError('inspect.signature called during resolve')
+
+    monkeypatch.setattr(inspect, 'signature', fail)
+    bar1 = await container.resolve(Bar)
+    bar2 = await container.resolve(Bar)
+    assert bar1 is not bar2
+    assert isinstance(bar1.foo, Foo)
@@ -0,0 +1,186 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource
+from pyautofac.exceptions import NotRegistered, PoolExhausted
+from pyautofac.pool import InstancePool, PoolOptions
+
+
+class Settings:
+    pass
+
+
+class Parser:
+    created = 0
+
+    def __init__(self, settings: Settings):
+        Parser.created += 1
+        self.settings = settings
+        self.buffer = []
+        self.broken = False
+
+
+class Connection(IAsyncResource):
+    def __init__(self):
+        self.state = None
+
+    async def initialize(self):
+        self.state = 'open'
+
+    async def dispose(self, exc=None):
+        self.state = 'closed'
+
+
+def reset(parser):
+    parser.buffer.clear()
+
+
+def build(**options):
+    Parser.created = 0
+    builder = ContainerBuilder()
+    builder.register_class(Settings).per_lifetime()
+    builder.register_class(Parser).pooled(reset=reset, **options)
+    builder.register_class(Connection).pooled(max_size=1)
+    return builder.build()
+
+
+@pytest.mark.asyncio
+async def test_instances_return_to_pool():
+    container = build()
+    async with container.create_nested() as nested:
+        p1 = await nested.resolve(Parser)
+        p2 = await nested.resolve(Parser)
+        assert p1 is not p2
+        p1.buffer.append('data')
+    async with container.create_nested() as nested:
+        p3 = await nested.resolve(Parser)
+    assert p3 in (p1, p2)
+    assert p3.buffer == []
+    assert Parser.created == 2
+    pool = container.pool(Parser)
+    assert pool.to_dict() == {
+        'size': 2, 'idle': 2, 'hits': 1, 'misses': 2, 'waits': 0, 'evictions': 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_dependencies_come_from_root():
+    container = build()
+    async with container.create_nested() as nested:
+        parser = await nested.resolve(Parser)
+        assert parser.settings is await container.resolve(Settings)
+        assert parser.settings is not await nested.resolve(Settings)
+
+
+@pytest.mark.asyncio
+async def test_max_size_waits():
+    container = build(max_size=1)
+    order = []
+
+    async def request(name):
+        async with container.create_nested() as nested:
+            parser = await nested.resolve(Parser)
+            order.append((name, 'start'))
+            await asyncio.sleep(0.01)
+            order.append((name, 'end'))
+            return parser
+
+    p1, p2 = await asyncio.gather(request(1), request(2))
+    assert p1 is p2
+    assert order == [(1, 'start'), (1, 'end'), (2, 'start'), (2, 'end')]
+    assert container.pool(Parser).waits == 1
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_lose_instance():
+    container = build(max_size=1)
+    pool = container.pool(Parser)
+    async with container.create_nested() as holder:
+        parser = await holder.resolve(Parser)
+        waiting = asyncio.ensure_future(container.create_nested().resolve(Parser))
+        await asyncio.sleep(0)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert not pool._waiters
+    assert pool.to_dict()['size'] == pool.idle == 1
+    async with container.create_nested() as nested:
+        assert await asyncio.wait_for(nested.resolve(Parser), 1) is parser
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_after_handover():
+    container = build(max_size=1)
+    pool = container.pool(Parser)
+    async with container.create_nested() as holder:
+        parser = await holder.resolve(Parser)
+        waiting = asyncio.ensure_future(container.create_nested().resolve(Parser))
+        await asyncio.sleep(0)
+    # the instance was handed to the waiter, which is cancelled before it runs
+    waiting.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiting
+    assert pool.idle == 1
+    async with container.create_nested() as nested:
+        assert await asyncio.wait_for(nested.resolve(Parser), 1) is parser
+
+
+@pytest.mark.asyncio
+async def test_scope_holding_whole_pool():
+    container = build(max_size=1)
+    async with container.create_nested() as nested:
+        await nested.resolve(Parser)
+        with pytest.raises(PoolExhausted):
+            await nested.resolve(Parser)
+
+
+@pytest.mark.asyncio
+async def test_min_size_and_evict():
+    container = build(min_size=2, evict=lambda parser: parser.broken)
+    await container.warm_up()
+    pool = container.pool(Parser)
+    assert pool.size == pool.idle == 2
+    async with container.create_nested() as nested:
+        parser = await nested.resolve(Parser)
+        parser.broken = True
+    assert pool.evictions == 1
+    assert pool.size == 1
+    assert parser not in pool._idle
+
+
+@pytest.mark.asyncio
+async def test_failed_fill_releases_slots():
+    calls = []
+
+    async def create():
+        calls.append(None)
+        if len(calls) == 2:
+            raise RuntimeError('transient')
+        return object()
+
+    pool = InstancePool(PoolOptions(min_size=3, max_size=3), create)
+    with pytest.raises(RuntimeError):
+        await pool.borrow()
+    assert pool.size == pool.idle == 1
+    first, second = await asyncio.wait_for(asyncio.gather(pool.borrow(), pool.borrow()), 1)
+    assert first is not second
+    assert pool.size == 3 and pool.idle == 1
+
+
+@pytest.mark.asyncio
+async def test_pooled_resources():
+    container = build()
+    async with container.create_nested() as nested:
+        connection = await nested.resolve(Connection)
+        assert connection.state == 'open'
+    assert connection.state == 'open'
+    async with container.create_nested() as nested:
+        assert await nested.resolve(Connection) is connection
+    await container.dispose()
+    assert connection.state == 'closed'
+
+
+def test_not_pooled():
+    container = build()
+    with pytest.raises(NotRegistered):
+        container.pool(Settings)
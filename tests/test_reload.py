@@ -0,0 +1,238 @@
+import asyncio
+import json
+import logging
+import os
+import threading
+
+import pytest
+
+from pyautofac import ConfigurationBuilder, IConfiguration
+from pyautofac import reloadable
+
+
+def write(path, data):
+    # replacing the file changes its inode, so quick rewrites are always noticed
+    tmp = str(path) + '.tmp'
+    with open(tmp, 'w') as fo:
+        json.dump(data, fo)
+    os.replace(tmp, str(path))
+
+
+@pytest.fixture
+def files(tmp_path):
+    base = tmp_path / 'base.json'
+    override = tmp_path / 'override.json'
+    write(base, {'db': {'host': 'a', 'port': 1}, 'cache': {'size': 10}})
+    write(override, {'db': {'port': 2}})
+    return base, override
+
+
+def build(files):
+    base, override = files
+    return ConfigurationBuilder()  \
+        .add_json_file(str(base))  \
+        .add_json_file(str(override))  \
+        .add_command_line(['--cache:ttl=5'])  \
+        .build_reloadable()
+
+
+def test_reload_diff_and_precedence(files):
+    base, override = files
+    config = build(files)
+    assert isinstance(config, IConfiguration)
+    assert config['db:port'] == '2'
+    snapshot = config.snapshot
+    assert config.reload() == {}
+    assert config.snapshot is snapshot
+
+    write(base, {'db': {'host': 'b', 'port': 3}, 'cache': {'ttl': 1}})
+    diff = config.reload()
+    assert diff == {'db:host': ('a', 'b'), 'cache:size': ('10', None)}
+    assert config['db:port'] == '2'
+    assert config['cache:ttl'] == '5'
+    assert snapshot['db:host'] == 'a'
+    assert config.get_section('db').to_dict() == {'host': 'b', 'port': '2'}
+
+
+def test_reload_reads_only_changed_files(files, monkeypatch):
+    base, override = files
+    config = build(files)
+    read = []
+    original = reloadable._FileSource.read
+
+    def counting(source):
+        read.append(source.path)
+        return original(source)
+
+    monkeypatch.setattr(reloadable._FileSource, 'read', counting)
+    write(override, {'db': {'port': 4}})
+    assert config.reload() == {'db:port': ('2', '4')}
+    assert read == [str(override)]
+
+
+def test_subscribers(files):
+    base, override = files
+    config = build(files)
+    db_changes = []
+    all_changes = []
+    config.subscribe(lambda changes, snapshot: db_changes.append(changes), prefix='db')
+    unsubscribe = config.subscribe(lambda changes, snapshot: all_changes.append(snapshot))
+
+    write(base, {'db': {'host': 'a', 'port': 1}, 'cache': {'size': 20}})
+    config.reload()
+    assert db_changes == []
+    assert all_changes == [config.snapshot]
+
+    unsubscribe()
+    write(override, {'db': {'port': 5}})
+    config.reload()
+    assert db_changes == [{'db:port': ('2', '5')}]
+    assert len(all_changes) == 1
+
+
+def test_failing_subscriber(files, caplog):
+    base, override = files
+    config = build(files)
+    received = []
+
+    def broken(changes, snapshot):
+        raise RuntimeError('broken')
+
+    config.subscribe(broken)
+    config.subscribe(lambda changes, snapshot: received.append(changes))
+    errors = []
+    write(override, {'db': {'port': 3}})
+    assert config.reload(on_error=errors.append) == {'db:port': ('2', '3')}
+    assert [str(error) for error in errors] == ['broken']
+    assert received == [{'db:port': ('2', '3')}]
+
+    write(override, {'db': {'port': 4}})
+    with caplog.at_level(logging.ERROR, logger='pyautofac.reloadable'):
+        config.reload()
+    assert 'broken' in caplog.text
+    assert len(received) == 2
+    assert config['db:port'] == '4'
+
+
+def test_broken_file_keeps_snapshot(files):
+    base, override = files
+    config = build(files)
+    with open(str(override), 'w') as fo:
+        fo.write('{"db": ')
+    with pytest.raises(ValueError):
+        config.reload()
+    assert config['db:port'] == '2'
+    write(override, {'db': {'port': 6}})
+    assert config.reload() == {'db:port': ('2', '6')}
+
+
+async def wait_for_value(config, key, value):
+    for _ in range(200):
+        if config.get(key, None) == value:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError('%s never became %s' % (key, value))
+
+
+@pytest.mark.asyncio
+async def test_watch(files):
+    base, override = files
+    config = build(files)
+    task = asyncio.ensure_future(config.watch(interval=0.05))
+    try:
+        await asyncio.sleep(0.05)
+        write(override, {'db': {'port': 7}})
+        await wait_for_value(config, 'db:port', '7')
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_watch_polling_fallback(files, monkeypatch):
+    base, override = files
+    monkeypatch.setattr(reloadable._Inotify, 'create', classmethod(lambda cls, paths: None))
+    config = build(files)
+    errors = []
+    task = asyncio.ensure_future(config.watch(interval=0.01, on_error=errors.append))
+    try:
+        with open(str(override), 'w') as fo:
+            fo.write('{"db": ')
+        await asyncio.sleep(0.05)
+        assert errors and config['db:port'] == '2'
+        write(override, {'db': {'port': 8}})
+        await wait_for_value(config, 'db:port', '8')
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+@pytest.mark.asyncio
+async def test_watch_logs_errors_without_handler(files, monkeypatch, caplog):
+    base, override = files
+    monkeypatch.setattr(reloadable._Inotify, 'create', classmethod(lambda cls, paths: None))
+    config = build(files)
+    task = asyncio.ensure_future(config.watch(interval=0.01))
+    try:
+        with caplog.at_level(logging.ERROR, logger='pyautofac.reloadable'):
+            with open(str(override), 'w') as fo:
+                fo.write('{"db": ')
+            await asyncio.sleep(0.05)
+        assert 'Reloading configuration failed' in caplog.text
+        assert config['db:port'] == '2'
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+
+def test_incremental_index_matches_rebuild():
+    import random
+    from pyautofac.configuration import _build_index, _to_dict, _update_index
+
+    rng = random.Random(7)
+    keys = ['a', 'a:b', 'a:b:c', 'a:d', 'e:f:g', 'e:h', 'i']
+    mapping = {}
+    for _ in range(300):
+        old_index = _build_index(mapping)
+        new = dict(mapping)
+        for key in rng.sample(keys, 3):
+            if key in new and rng.random() < 0.5:
+                del new[key]
+            else:
+                new[key] = str(rng.random())
+        changed = {key for key in keys if mapping.get(key) != new.get(key)}
+        index = _update_index(old_index, new, changed)
+        assert _to_dict(index) == _to_dict(_build_index(new))
+        mapping = new
+
+
+@pytest.mark.asyncio
+async def test_watch_reads_in_executor(files, monkeypatch):
+    base, override = files
+    monkeypatch.setattr(reloadable._Inotify, 'create', classmethod(lambda cls, paths: None))
+    config = build(files)
+    loop_thread = threading.get_ident()
+    read_threads = []
+    original = reloadable._FileSource.read
+
+    def recording(source):
+        read_threads.append(threading.get_ident())
+        return original(source)
+
+    monkeypatch.setattr(reloadable._FileSource, 'read', recording)
+    notified = []
+    config.subscribe(lambda changes, snapshot: notified.append(threading.get_ident()))
+    task = asyncio.ensure_future(config.watch(interval=0.01))
+    try:
+        write(override, {'db': {'port': 9}})
+        await wait_for_value(config, 'db:port', '9')
+        await asyncio.sleep(0.02)
+    finally:
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+    assert read_threads and loop_thread not in read_threads
+    assert notified == [loop_thread]
@@ -0,0 +1,180 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, ContainerStats, IAsyncResource
+from pyautofac.container import DummyContainer, IContainer
+from pyautofac.exceptions import NotRegistered
+
+
+class Settings:
+    pass
+
+
+class Session:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+
+class Tracker:
+    def __init__(self):
+        self.running = 0
+        self.max_running = 0
+
+
+class Slow(IAsyncResource):
+    def __init__(self, tracker: Tracker):
+        self.tracker = tracker
+
+    async def initialize(self):
+        self.tracker.running += 1
+        self.tracker.max_running = max(self.tracker.max_running, self.tracker.running)
+        await asyncio.sleep(0.01)
+        self.tracker.running -= 1
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class SlowA(Slow):
+    pass
+
+
+class SlowB(Slow):
+    pass
+
+
+class Request:
+    pass
+
+
+def build():
+    builder = ContainerBuilder()
+    builder.register_class(Settings).single_instance()
+    builder.register_class(Session).per_lifetime()
+    builder.register_class(Tracker).single_instance()
+    builder.register_class(SlowA).per_lifetime()
+    builder.register_class(SlowB).per_lifetime()
+    builder.register_class(Request)
+    return builder.build()
+
+
+@pytest.mark.asyncio
+async def test_resolve_many():
+    container = build()
+    nested = container.create_nested()
+    settings, session, session2, a, b = await nested.resolve_many(
+        Settings, Session, Session, SlowA, SlowB)
+    assert session is session2
+    assert session.settings is settings
+    assert settings is await container.resolve(Settings)
+    assert a is await nested.resolve(SlowA)
+    assert b is await nested.resolve(SlowB)
+    r1, r2 = await nested.resolve_many(Request, Request)
+    assert r1 is not r2
+
+
+@pytest.mark.asyncio
+async def test_resolve_all_parallel():
+    container = build()
+    nested = container.create_nested()
+    result = await nested.resolve_all(iter([SlowA, SlowB, Session]), parallel=True)
+    assert [type(item) for item in result] == [SlowA, SlowB, Session]
+    tracker = await nested.resolve(Tracker)
+    assert tracker.max_running == 2
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_not_registered():
+    container = build()
+    with pytest.raises(NotRegistered):
+        await container.resolve_many(Settings, int)
+
+
+@pytest.mark.asyncio
+async def test_default_implementation():
+    container = build()
+
+    class Wrapper(DummyContainer):
+        async def resolve(self, cls):
+            return await container.resolve(cls)
+
+    wrapper = Wrapper()
+    assert isinstance(wrapper, IContainer)
+    settings, session = await wrapper.resolve_many(Settings, Session)
+    assert session.settings is settings
+
+
+
+class Shared(IAsyncResource):
+    async def initialize(self):
+        await asyncio.sleep(0.01)
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Left:
+    def __init__(self, shared: Shared, settings: Settings):
+        self.shared = shared
+
+
+class Right:
+    def __init__(self, shared: Shared):
+        self.shared = shared
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('parallel', [False, True])
+async def test_resolve_all_builds_shared_dependencies_once(parallel):
+    builder = ContainerBuilder()
+    builder.register_class(Settings).single_instance()
+    builder.register_class(Shared).per_lifetime()
+    builder.register_class(Left)
+    builder.register_class(Right)
+    stats = ContainerStats()
+    container = builder.build(stats=stats)
+    nested = container.create_nested()
+    with stats.trace() as root:
+        left, right, other = await nested.resolve_all([Left, Right, Right], parallel=parallel)
+    assert left.shared is right.shared is other.shared
+    assert right is not other
+    # shared dependencies are constructed ahead of the requested services
+    assert {node.interface for node in root.children[:2]} == {Shared, Settings}
+    assert [node.interface for node in root.children[2:]] == [Left, Right, Right]
+    assert all(child.cached for node in root.children[2:] for child in node.children)
+    assert stats[Shared].misses == 1
+
+
+class Counter:
+    def __init__(self):
+        self.created = 0
+
+
+class PerRequest(IAsyncResource):
+    def __init__(self, counter: Counter):
+        counter.created += 1
+
+    async def initialize(self):
+        pass
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Root:
+    def __init__(self, request: PerRequest):
+        self.request = request
+
+
+@pytest.mark.asyncio
+async def test_resolve_many_root_singleton_with_scoped_dependency():
+    builder = ContainerBuilder()
+    builder.register_class(Counter).single_instance()
+    builder.register_class(PerRequest).per_lifetime()
+    builder.register_class(Root).single_instance()
+    container = builder.build()
+    nested = container.create_nested()
+    root, = await nested.resolve_many(Root)
+    assert root is await container.resolve(Root)
+    counter = await container.resolve(Counter)
+    assert counter.created == 1
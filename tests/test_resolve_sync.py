@@ -0,0 +1,97 @@
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource, SyncFactory
+from pyautofac.exceptions import NotSyncResolvable
+
+
+class Settings:
+    pass
+
+
+class Parser:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+
+class Worker:
+    def __init__(self, parser: Parser, parsers: SyncFactory[Parser]):
+        self.parser = parser
+        self.parsers = parsers
+
+
+class Connection(IAsyncResource):
+    async def initialize(self):
+        pass
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Repository:
+    def __init__(self, connection: Connection):
+        self.connection = connection
+
+
+class UsesFactory:
+    def __init__(self, repositories: SyncFactory[Repository]):
+        self.repositories = repositories
+
+
+def build():
+    builder = ContainerBuilder()
+    builder.register_class(Settings).single_instance()
+    builder.register_class(Parser)
+    builder.register_class(Worker).per_lifetime()
+    builder.register_class(Connection).single_instance()
+    builder.register_class(Repository)
+    builder.register_class(UsesFactory)
+    return builder.build()
+
+
+def test_sync_plans_decided_at_build():
+    container = build()
+    assert container._mapping[Worker].sync
+    assert container._mapping[UsesFactory].sync
+    assert not container._mapping[Repository].sync
+    assert not container._mapping[Connection].sync
+
+
+def test_resolve_sync():
+    container = build()
+    worker = container.resolve_sync(Worker)
+    assert worker is container.resolve_sync(Worker)
+    assert worker.parser.settings is container.resolve_sync(Settings)
+    parser = worker.parsers()
+    assert isinstance(parser, Parser)
+    assert parser is not worker.parser
+    nested = container.create_nested()
+    assert nested.resolve_sync(Worker) is not worker
+    assert nested.resolve_sync(Settings) is worker.parser.settings
+
+
+def test_resolve_sync_rejects_async_graph():
+    container = build()
+    with pytest.raises(NotSyncResolvable):
+        container.resolve_sync(Repository)
+    factory = container.resolve_sync(UsesFactory)
+    with pytest.raises(NotSyncResolvable):
+        factory.repositories()
+
+
+def test_validate_rejects_sync_factory_of_async_graph():
+    builder = ContainerBuilder()
+    builder.register_class(Connection).single_instance()
+    builder.register_class(Repository)
+    builder.register_class(UsesFactory)
+    with pytest.raises(NotSyncResolvable) as error:
+        builder.build(validate=True)
+    assert 'Repository' in str(error.value) and 'UsesFactory' in str(error.value)
+
+
+@pytest.mark.asyncio
+async def test_sync_and_async_share_instances():
+    container = build()
+    worker = await container.resolve(Worker)
+    assert container.resolve_sync(Worker) is worker
+    repository = await container.resolve(Repository)
+    assert isinstance(repository.connection, Connection)
@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, ContainerStats, IAsyncResource
+
+
+class Settings:
+    pass
+
+
+class Pool(IAsyncResource):
+    def __init__(self, settings: Settings):
+        self.settings = settings
+
+    async def initialize(self):
+        await asyncio.sleep(0.01)
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Repository:
+    def __init__(self, pool: Pool, settings: Settings):
+        self.pool = pool
+
+
+class Handler:
+    def __init__(self, repository: Repository):
+        self.repository = repository
+
+
+def build(stats=None):
+    builder = ContainerBuilder()
+    builder.register_class(Settings).single_instance()
+    builder.register_class(Pool).single_instance()
+    builder.register_class(Repository).per_lifetime()
+    builder.register_class(Handler)
+    return builder.build(stats=stats)
+
+
+@pytest.mark.asyncio
+async def test_disabled_by_default():
+    container = build()
+    assert container._stats is None
+    await container.resolve(Handler)
+
+
+@pytest.mark.asyncio
+async def test_counters():
+    stats = ContainerStats()
+    container = build(stats)
+    for _ in range(3):
+        async with container.create_nested() as nested:
+            await nested.resolve(Handler)
+            await nested.resolve(Repository)
+    await container.dispose()
+    assert stats[Handler].misses == 3
+    assert stats[Repository].misses == 3
+    assert stats[Repository].hits == 3
+    assert stats[Pool].misses == 1
+    assert stats[Pool].initialize_time >= 0.01
+    assert stats[Pool].dispose_time > 0
+    assert stats[Settings].resolves == 4
+    assert stats[Settings].hits == 3
+    assert stats[Handler].construction_time >= stats[Pool].initialize_time
+    assert stats.to_dict()['Pool']['misses'] == 1
+
+
+@pytest.mark.asyncio
+async def test_wait_time():
+    stats = ContainerStats()
+    container = build(stats)
+    await asyncio.gather(container.resolve(Pool), container.resolve(Pool))
+    assert stats[Pool].misses == 1
+    assert stats[Pool].hits == 1
+    assert stats[Pool].wait_time > 0
+
+
+@pytest.mark.asyncio
+async def test_trace():
+    stats = ContainerStats()
+    container = build(stats)
+    with stats.trace() as root:
+        await container.resolve(Handler)
+    assert len(root.children) == 1
+    handler = root.children[0]
+    assert handler.interface is Handler
+    repository, = handler.children
+    pool, settings = repository.children
+    assert pool.interface is Pool
+    assert pool.initialize >= 0.01
+    assert settings.cached
+    text = root.format()
+    assert text.splitlines()[0].startswith('Handler ')
+    assert '    Pool ' in text and 'initialize' in text
+    assert '    Settings (cached)' in text
+    assert root.to_dict()['children'][0]['interface'] == 'Handler'
+    await container.resolve(Handler)
+    assert len(root.children) == 1
+
+
+@pytest.mark.asyncio
+async def test_trace_without_contextvars(monkeypatch):
+    from pyautofac import stats as stats_module
+    monkeypatch.setattr(stats_module, '_current_node', stats_module._TaskLocal('test', default=None))
+    stats = ContainerStats()
+    container = build(stats)
+    with stats.trace() as root:
+        await container.resolve(Handler)
+    handler, = root.children
+    repository, = handler.children
+    assert [node.interface for node in repository.children] == [Pool, Settings]
+    await container.resolve(Handler)
+    assert len(root.children) == 1
@@ -0,0 +1,123 @@
+import asyncio
+import threading
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource
+
+
+THREADS = 8
+TASKS = 50
+
+
+class Counter:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def hit(self, name):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+
+class Pool(IAsyncResource):
+    def __init__(self, counter: Counter):
+        self.counter = counter
+
+    async def initialize(self):
+        await asyncio.sleep(0.01)
+        self.counter.hit('pool')
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Settings:
+    def __init__(self, counter: Counter):
+        counter.hit('settings')
+
+
+class Handler:
+    def __init__(self, pool: Pool, settings: Settings):
+        self.pool = pool
+        self.settings = settings
+
+
+def build():
+    counter = Counter()
+    builder = ContainerBuilder()
+    builder.register_instance(counter)
+    builder.register_class(Pool).single_instance()
+    builder.register_class(Settings).single_instance()
+    builder.register_class(Handler).per_lifetime()
+    return counter, builder.build()
+
+
+def run_threads(target):
+    barrier = threading.Barrier(THREADS)
+    results = []
+    errors = []
+
+    def worker():
+        try:
+            barrier.wait()
+            results.extend(target())
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    return results
+
+
+def test_threads_and_loops():
+    counter, container = build()
+
+    async def resolve_many():
+        async def one():
+            async with container.create_nested() as nested:
+                return await nested.resolve(Handler)
+        return await asyncio.gather(*(one() for _ in range(TASKS)))
+
+    handlers = run_threads(lambda: asyncio.run(resolve_many()))
+    assert len(handlers) == THREADS * TASKS
+    assert len({id(handler.pool) for handler in handlers}) == 1
+    assert len({id(handler.settings) for handler in handlers}) == 1
+    assert counter.counts == {'pool': 1, 'settings': 1}
+
+
+def test_threads_sync():
+    counter, container = build()
+    settings = run_threads(lambda: [container.resolve_sync(Settings) for _ in range(TASKS)])
+    assert len({id(s) for s in settings}) == 1
+    assert counter.counts == {'settings': 1}
+
+
+class Flaky(IAsyncResource):
+    attempts = 0
+
+    async def initialize(self):
+        Flaky.attempts += 1
+        await asyncio.sleep(0.01)
+        if Flaky.attempts == 1:
+            raise RuntimeError('first attempt fails')
+
+    async def dispose(self, exc=None):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_waiters_retry_after_failure():
+    builder = ContainerBuilder()
+    builder.register_class(Flaky).single_instance()
+    container = builder.build()
+    results = await asyncio.gather(*(container.resolve(Flaky) for _ in range(5)),
+                                   return_exceptions=True)
+    errors = [r for r in results if isinstance(r, BaseException)]
+    instances = {id(r) for r in results if not isinstance(r, BaseException)}
+    assert len(errors) == 1
+    assert len(instances) == 1
+    assert Flaky.attempts == 2
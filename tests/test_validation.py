@@ -0,0 +1,125 @@
+import pytest
+
+from pyautofac import ContainerBuilder, Factory
+from pyautofac.exceptions import (
+    CircularDependency, InvalidRegistration, NotAnnotatedConstructorParam, NotRegistered,
+)
+
+
+class Missing:
+    pass
+
+
+class Leaf:
+    pass
+
+
+class Middle:
+    def __init__(self, leaf: Leaf, missing: Missing):
+        pass
+
+
+class Top:
+    def __init__(self, middle: Middle):
+        pass
+
+
+class UsesFactory:
+    def __init__(self, factory: Factory[Missing]):
+        pass
+
+
+class Broken:
+    def __init__(self, leaf):
+        pass
+
+
+class A:
+    def __init__(self, leaf: Leaf, b: 'B'):
+        pass
+
+
+class B:
+    def __init__(self, a: A):
+        pass
+
+
+A.__init__.__annotations__['b'] = B
+
+
+def test_valid_graph():
+    builder = ContainerBuilder()
+    builder.register_class(Top)
+    builder.register_class(Middle)
+    builder.register_class(Leaf)
+    builder.register_class(Missing)
+    container = builder.build(validate=True)
+    assert container._graph.adjacency[Top] == (Middle,)
+    assert container._graph.dependents[Leaf] == [Middle]
+    assert container._graph.cyclic == set()
+
+
+def test_missing_registration():
+    builder = ContainerBuilder()
+    builder.register_class(Top)
+    builder.register_class(Middle)
+    builder.register_class(Leaf)
+    builder.build()
+    with pytest.raises(NotRegistered) as info:
+        builder.build(validate=True)
+    assert 'Top -> Middle' in str(info.value)
+
+
+def test_missing_factory_target():
+    builder = ContainerBuilder()
+    builder.register_class(UsesFactory)
+    with pytest.raises(NotRegistered):
+        builder.build(validate=True)
+
+
+def test_not_annotated():
+    builder = ContainerBuilder()
+    builder.register_class(Broken)
+    with pytest.raises(InvalidRegistration) as info:
+        builder.build(validate=True)
+    assert 'Broken' in str(info.value)
+    assert 'NotAnnotatedConstructorParam' in str(info.value)
+    assert info.value.interface is Broken
+    assert isinstance(info.value.__cause__, NotAnnotatedConstructorParam)
+    assert info.value.__cause__.__traceback__ is not None
+
+
+class TwoArgumentError(Exception):
+    def __init__(self, first, second):
+        super().__init__(first, second)
+
+
+class Custom:
+    pass
+
+
+def test_plan_error_with_custom_exception(monkeypatch):
+    from pyautofac import plan as plan_module
+
+    def fail(cls):
+        raise TwoArgumentError(1, 2)
+
+    monkeypatch.setattr(plan_module, 'get_constructor_params', fail)
+    builder = ContainerBuilder()
+    builder.register_class(Custom)
+    with pytest.raises(InvalidRegistration) as info:
+        builder.build(validate=True)
+    assert isinstance(info.value.__cause__, TwoArgumentError)
+    assert info.value.path == (Custom,)
+
+
+def test_cycle():
+    builder = ContainerBuilder()
+    builder.register_class(A)
+    builder.register_class(B)
+    builder.register_class(Leaf)
+    container = builder.build()
+    assert container._graph.cyclic == {A, B}
+    with pytest.raises(CircularDependency) as info:
+        builder.build(validate=True)
+    assert str(info.value) == 'Circular dependency: A -> B -> A'
@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+
+from pyautofac import ContainerBuilder, IAsyncResource
+
+
+class Log:
+    def __init__(self):
+        self.messages = []
+        self.running = 0
+        self.max_running = 0
+
+
+class Resource(IAsyncResource):
+    def __init__(self, log: Log):
+        self.log = log
+
+    async def initialize(self):
+        self.log.running += 1
+        self.log.max_running = max(self.log.max_running, self.log.running)
+        await asyncio.sleep(0.01)
+        self.log.running -= 1
+        self.log.messages.append(type(self).__name__)
+
+    async def dispose(self, exc=None):
+        pass
+
+
+class Db(Resource):
+    pass
+
+
+class Cache(Resource):
+    pass
+
+
+class Queue(Resource):
+    pass
+
+
+class Repository(Resource):
+    def __init__(self, log: Log, db: Db):
+        super().__init__(log)
+
+
+class Scoped(Resource):
+    pass
+
+
+def build():
+    log = Log()
+    builder = ContainerBuilder()
+    builder.register_instance(log)
+    builder.register_class(Repository).single_instance()
+    builder.register_class(Db).single_instance()
+    builder.register_class(Cache).single_instance()
+    builder.register_class(Queue).single_instance()
+    builder.register_class(Scoped).per_lifetime()
+    return log, builder.build()
+
+
+@pytest.mark.asyncio
+async def test_warm_up():
+    log, container = build()
+    timings = await container.warm_up()
+    assert set(timings) == {Repository, Db, Cache, Queue}
+    assert all(t > 0 for t in timings.values())
+    assert log.messages.index('Db') < log.messages.index('Repository')
+    assert 'Scoped' not in log.messages
+    assert log.max_running == 1
+    count = len(log.messages)
+    await container.resolve(Repository)
+    assert len(log.messages) == count
+
+
+@pytest.mark.asyncio
+async def test_warm_up_parallel():
+    log, container = build()
+    await container.warm_up(parallel=True)
+    assert sorted(log.messages) == ['Cache', 'Db', 'Queue', 'Repository']
+    assert log.max_running > 1
+
+
+@pytest.mark.asyncio
+async def test_warm_up_concurrency_limit():
+    log, container = build()
+    await container.warm_up(parallel=True, concurrency=2)
+    assert sorted(log.messages) == ['Cache', 'Db', 'Queue', 'Repository']
+    assert log.max_running == 2